@@ -1,27 +1,183 @@
-from field_mask import FieldMaskBits, ProductFields
+from bisect import insort
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from field_mask import FieldMaskBits, ProductFields, compile_mask
+
+
+class _MaskIndex:
+    """Hash index: tuple of the masked field values -> sorted row positions."""
+
+    def __init__(self, mask: ProductFields):
+        self.mask = mask
+        self.key = compile_mask(mask).key
+        self._buckets: Dict[Tuple, List[int]] = {}
+
+    def insert(self, key: Tuple, pos: int):
+        insort(self._buckets.setdefault(key, []), pos)
+
+    def move_many(self, moves: List[Tuple[Tuple, Tuple, int]]):
+        """Apply (old key, new key, pos) moves, rebuilding every touched bucket once."""
+        removed: Dict[Tuple, Set[int]] = {}
+        added: Dict[Tuple, List[int]] = {}
+        for old_key, new_key, pos in moves:
+            removed.setdefault(old_key, set()).add(pos)
+            added.setdefault(new_key, []).append(pos)
+        for key in removed.keys() | added.keys():
+            bucket = self._buckets.get(key, [])
+            gone = removed.get(key)
+            if gone:
+                bucket = [pos for pos in bucket if pos not in gone]
+            extra = added.get(key)
+            if extra:
+                bucket = sorted(bucket + extra)  # two sorted runs: a linear merge
+            if bucket:
+                self._buckets[key] = bucket
+            else:
+                self._buckets.pop(key, None)
+
+    def lookup(self, key: Tuple) -> List[int]:
+        return self._buckets.get(key, [])
+
+
+class _NameIndex(_MaskIndex):
+    """Case-insensitive name index used by find_by_name."""
+
+    def __init__(self):
+        super().__init__(ProductFields.NAME)
+        self.key = lambda product: (product.name.lower(),)
+
+
+def merge_products(products, mask: FieldMaskBits) -> Tuple[List, List[int]]:
+    """One-pass dedupe by the masked fields: the first product of each group wins.
+
+    Returns the kept products and, aligned with them, the size of every group.
+    """
+    key_of = mask.compiled.key
+    slots: Dict[Tuple, int] = {}
+    merged = []
+    sizes: List[int] = []
+    for product in products:
+        key = key_of(product)
+        slot = slots.get(key)
+        if slot is None:
+            slots[key] = len(merged)
+            merged.append(product)
+            sizes.append(1)
+        else:
+            sizes[slot] += 1
+    return merged, sizes
+
+
+class CopyReport(NamedTuple):
+    touched: List[int]                  # rows updated by each source, aligned with the input (0 if overridden)
+    conflicts: Dict[Tuple, List[int]]   # equality key -> indices of sources that disagree
+
 
 class ProductRepository:
+    # secondary indexes that are kept up to date from the start;
+    # any other mask combination gets its index on the first find_by
+    _EAGER_MASKS = (ProductFields.ID, ProductFields.CATEGORY, ProductFields.MANUFACTURER)
+
     def __init__(self):
         self._data = []
+        self._name_index = _NameIndex()
+        self._by_mask: Dict[ProductFields, _MaskIndex] = {m: _MaskIndex(m) for m in self._EAGER_MASKS}
+        self._indexes: List[_MaskIndex] = [self._name_index, *self._by_mask.values()]
 
     def add(self, product):
+        pos = len(self._data)
         self._data.append(product)
+        for index in self._indexes:
+            index.insert(index.key(product), pos)
 
     def get_all(self):
         return self._data
 
     def find_by_name(self, name: str):
-        return [p for p in self._data if p.name.lower() == name.lower()]
+        return [self._data[i] for i in self._name_index.lookup((name.lower(),))]
 
-    def merge_by_mask(self, mask: FieldMaskBits):
-        merged = []
-        for product in self._data:
-            if any(FieldMaskBits.are_equal(product, m, mask) for m in merged):
-                continue
-            merged.append(product)
+    def find_by(self, mask: FieldMaskBits, probe):
+        """Products equal to `probe` on every field selected by `mask`."""
+        index = self._index_for(mask.mask)
+        return [self._data[i] for i in index.lookup(index.key(probe))]
+
+    def merge_by_mask(self, mask: FieldMaskBits, report: bool = False):
+        """Drop products equal to an earlier one by `mask`.
+
+        With `report=True` returns the group size for every kept product.
+        """
+        merged, sizes = merge_products(self._data, mask)
         self._data = merged
+        self._rebuild_indexes()
+        return sizes if report else None
 
     def copy_data(self, source, equal_mask: FieldMaskBits, copy_mask: FieldMaskBits):
-        for p in self._data:
-            if FieldMaskBits.are_equal(p, source, equal_mask):
-                FieldMaskBits.copy_fields(source, p, copy_mask)
+        index = self._index_for(equal_mask.mask)
+        self._apply_copy([(source, list(index.lookup(index.key(source))))], copy_mask)
+
+    def copy_data_many(self, sources: Iterable, equal_mask: FieldMaskBits, copy_mask: FieldMaskBits) -> CopyReport:
+        """Hash join of `sources` against the repository on `equal_mask`.
+
+        Rows are matched against the state before the batch. Sources sharing an
+        equality key form one group; the last one wins, as with sequential
+        copy_data calls, and the group is reported as a conflict when its members
+        carry different values for the copied fields.
+        """
+        sources = list(sources)
+        index = self._index_for(equal_mask.mask)
+        value_key = compile_mask(copy_mask.mask & ~ProductFields.ID).key
+        groups: Dict[Tuple, List[int]] = {}
+        for i, src in enumerate(sources):
+            groups.setdefault(index.key(src), []).append(i)
+
+        touched = [0] * len(sources)
+        conflicts: Dict[Tuple, List[int]] = {}
+        plan = []
+        for key, members in groups.items():
+            targets = list(index.lookup(key))
+            # only the last source of a group is applied
+            touched[members[-1]] = len(targets)
+            if len(members) > 1 and len({value_key(sources[i]) for i in members}) > 1:
+                conflicts[key] = members
+            if targets:
+                plan.append((sources[members[-1]], targets))
+
+        self._apply_copy(plan, copy_mask)
+        return CopyReport(touched, conflicts)
+
+    def _apply_copy(self, plan: List[Tuple[object, List[int]]], copy_mask: FieldMaskBits):
+        """Copy each source into its target rows; index moves are applied once, after all copies."""
+        touched = [idx for idx in self._indexes if idx.mask & copy_mask.mask]
+        moves: List[List[Tuple[Tuple, Tuple, int]]] = [[] for _ in touched]
+        copy = copy_mask.compiled.copy
+        for source, targets in plan:
+            for pos in targets:
+                p = self._data[pos]
+                old_keys = [idx.key(p) for idx in touched]
+                copy(source, p)
+                for pending, idx, old_key in zip(moves, touched, old_keys):
+                    new_key = idx.key(p)
+                    if new_key != old_key:
+                        pending.append((old_key, new_key, pos))
+        for idx, pending in zip(touched, moves):
+            if pending:
+                idx.move_many(pending)
+
+    def _index_for(self, mask: ProductFields) -> _MaskIndex:
+        index = self._by_mask.get(mask)
+        if index is None:
+            index = _MaskIndex(mask)
+            for pos, product in enumerate(self._data):
+                index.insert(index.key(product), pos)
+            self._by_mask[mask] = index
+            self._indexes.append(index)
+        return index
+
+    def _rebuild_indexes(self):
+        masks = list(self._by_mask)
+        self._name_index = _NameIndex()
+        self._by_mask = {m: _MaskIndex(m) for m in masks}
+        self._indexes = [self._name_index, *self._by_mask.values()]
+        for pos, product in enumerate(self._data):
+            for index in self._indexes:
+                index.insert(index.key(product), pos)
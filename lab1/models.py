@@ -8,6 +8,8 @@ class ProductCategory(Enum):
 
 
 class Product:
+    __slots__ = ("id", "name", "price", "category", "manufacturer")
+
     def __init__(self, id_: int, name: str, price: float, category: ProductCategory, manufacturer: str):
         self.id = id_
         self.name = name
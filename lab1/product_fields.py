@@ -0,0 +1,59 @@
+from enum import IntFlag, auto
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, NamedTuple, Tuple
+
+class ProductFields(IntFlag):
+    NONE = 0
+    ID = auto()
+    NAME = auto()
+    PRICE = auto()
+    CATEGORY = auto()
+    MANUFACTURER = auto()
+    ALL = ID | NAME | PRICE | CATEGORY | MANUFACTURER
+
+
+FIELD_ATTRS = (
+    (ProductFields.ID, "id"),
+    (ProductFields.NAME, "name"),
+    (ProductFields.PRICE, "price"),
+    (ProductFields.CATEGORY, "category"),
+    (ProductFields.MANUFACTURER, "manufacturer"),
+)
+
+
+class CompiledMask(NamedTuple):
+    """Accessors specialized for one mask value, with no flag tests left inside."""
+    attrs: Tuple[str, ...]
+    key: Callable[[object], Tuple]
+    equal: Callable[[object, object], bool]
+    copy: Callable[[object, object], None]
+
+
+@lru_cache(maxsize=None)
+def compile_mask(mask: ProductFields) -> CompiledMask:
+    attrs = tuple(attr for flag, attr in FIELD_ATTRS if mask & flag)
+    if not attrs:
+        key = lambda obj: ()
+    elif len(attrs) == 1:
+        getter = attrgetter(attrs[0])
+        key = lambda obj: (getter(obj),)
+    else:
+        key = attrgetter(*attrs)
+
+    def equal(a, b) -> bool:
+        return key(a) == key(b)
+
+    # id is never copied, same as before compilation
+    copy_attrs = tuple(a for a in attrs if a != "id")
+    read = attrgetter(*copy_attrs) if len(copy_attrs) > 1 else None
+
+    def copy(src, dst) -> None:
+        if read is None:
+            for attr in copy_attrs:
+                setattr(dst, attr, getattr(src, attr))
+            return
+        for attr, value in zip(copy_attrs, read(src)):
+            setattr(dst, attr, value)
+
+    return CompiledMask(attrs, key, equal, copy)
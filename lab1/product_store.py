@@ -0,0 +1,181 @@
+import mmap
+import struct
+from collections.abc import Sequence
+from typing import Dict, Iterable, Tuple
+
+from database import ProductRepository, _NameIndex
+from models import ProductCategory
+
+# File layout:
+#   header  | magic, version, record count, heap offset
+#   records | fixed-width, one per product
+#   heap    | UTF-8 strings referenced by (offset, length) from the records; grows at EOF
+_HEADER = struct.Struct("<4sIQQ")
+_RECORD = struct.Struct("<qdB3xIIII")  # id, price, category, name off/len, manufacturer off/len
+_MAGIC = b"PRD1"
+_VERSION = 1
+
+_CATEGORIES = list(ProductCategory)
+_CATEGORY_CODES = {c: i for i, c in enumerate(_CATEGORIES)}
+
+# field -> (byte offset inside a record, struct format)
+_ID_AT = (0, "<q")
+_PRICE_AT = (8, "<d")
+_CATEGORY_AT = (16, "<B")
+_NAME_AT = 20
+_MANUFACTURER_AT = 28
+
+
+def write_store(path: str, products: Iterable) -> int:
+    """Write products into a new store file, deduplicating strings in the heap."""
+    products = list(products)
+    heap = bytearray()
+    offsets: Dict[str, Tuple[int, int]] = {}
+    heap_start = _HEADER.size + _RECORD.size * len(products)
+
+    def place(s: str) -> Tuple[int, int]:
+        ref = offsets.get(s)
+        if ref is None:
+            raw = s.encode("utf-8")
+            ref = offsets[s] = (heap_start + len(heap), len(raw))
+            heap.extend(raw)
+        return ref
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(products), heap_start))
+        for p in products:
+            f.write(_RECORD.pack(p.id, p.price, _CATEGORY_CODES[p.category], *place(p.name), *place(p.manufacturer)))
+        f.write(heap)
+    return len(products)
+
+
+class MappedRow:
+    """View of one record; reads decode straight from the mapping, writes go back into it."""
+    __slots__ = ("_store", "_at")
+
+    def __init__(self, store: "MappedProductStore", at: int):
+        self._store = store
+        self._at = at
+
+    @property
+    def id(self): return self._store._read(self._at, _ID_AT)
+    @id.setter
+    def id(self, v: int): self._store._write(self._at, _ID_AT, v)
+
+    @property
+    def name(self): return self._store._read_str(self._at + _NAME_AT)
+    @name.setter
+    def name(self, v: str): self._store._write_str(self._at + _NAME_AT, v)
+
+    @property
+    def price(self): return self._store._read(self._at, _PRICE_AT)
+    @price.setter
+    def price(self, v: float): self._store._write(self._at, _PRICE_AT, v)
+
+    @property
+    def category(self): return _CATEGORIES[self._store._read(self._at, _CATEGORY_AT)]
+    @category.setter
+    def category(self, v: ProductCategory): self._store._write(self._at, _CATEGORY_AT, _CATEGORY_CODES[v])
+
+    @property
+    def manufacturer(self): return self._store._read_str(self._at + _MANUFACTURER_AT)
+    @manufacturer.setter
+    def manufacturer(self, v: str): self._store._write_str(self._at + _MANUFACTURER_AT, v)
+
+    def __repr__(self):
+        return f"Product(id={self.id}, name={self.name}, price={self.price}, category={self.category.value}, manufacturer={self.manufacturer})"
+
+
+class MappedProductStore(Sequence):
+    """Sequence of MappedRow over a file produced by write_store.
+
+    Opening only reads the header, so it does not depend on the catalog size.
+    Read-only stores map with ACCESS_READ and can be shared by several processes.
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        self._file = open(path, "r+b" if writable else "rb")
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+        magic, version, self._count, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a product store (version {_VERSION})")
+        self._appended: Dict[str, Tuple[int, int]] = {}
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(self._count))]
+        if pos < 0:
+            pos += self._count
+        if not 0 <= pos < self._count:
+            raise IndexError("product record index out of range")
+        return MappedRow(self, _HEADER.size + pos * _RECORD.size)
+
+    def __iter__(self):
+        return (MappedRow(self, _HEADER.size + i * _RECORD.size) for i in range(self._count))
+
+    def _read(self, at: int, field):
+        offset, fmt = field
+        return struct.unpack_from(fmt, self._mm, at + offset)[0]
+
+    def _write(self, at: int, field, value):
+        offset, fmt = field
+        struct.pack_into(fmt, self._mm, at + offset, value)
+
+    def _read_str(self, at: int) -> str:
+        off, length = struct.unpack_from("<II", self._mm, at)
+        return self._mm[off:off + length].decode("utf-8")
+
+    def _write_str(self, at: int, value: str):
+        ref = self._appended.get(value)
+        if ref is None:
+            # the heap is the tail of the file, so new strings are appended at EOF
+            raw = value.encode("utf-8")
+            off = len(self._mm)
+            self._mm.resize(off + len(raw))
+            self._mm[off:off + len(raw)] = raw
+            ref = self._appended[value] = (off, len(raw))
+        struct.pack_into("<II", self._mm, at, *ref)
+
+
+class MappedProductRepository(ProductRepository):
+    """ProductRepository whose rows live in a MappedProductStore.
+
+    Indexes are built on first use instead of at open, and the record set is
+    fixed: add and merge_by_mask need a rewrite through write_store.
+    """
+
+    def __init__(self, store: MappedProductStore):
+        super().__init__()
+        self._data = store
+        self._name_index = None
+        self._by_mask = {}
+        self._indexes = []
+
+    def add(self, product):
+        raise TypeError("mapped store has a fixed record set; rebuild it with write_store")
+
+    def merge_by_mask(self, mask, report: bool = False):
+        raise TypeError("mapped store has a fixed record set; merge in memory and rewrite with write_store")
+
+    def find_by_name(self, name: str):
+        if self._name_index is None:
+            self._name_index = _NameIndex()
+            for pos, product in enumerate(self._data):
+                self._name_index.insert(self._name_index.key(product), pos)
+            self._indexes.append(self._name_index)
+        return super().find_by_name(name)
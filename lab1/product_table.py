@@ -0,0 +1,108 @@
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List
+
+from database import ProductRepository, merge_products
+from field_mask import FieldMaskBits
+from models import ProductCategory
+
+_CATEGORIES = list(ProductCategory)
+_CATEGORY_CODES = {c: i for i, c in enumerate(_CATEGORIES)}
+
+
+class ProductRow:
+    """Lazy view of one row of a ProductColumns; reads and writes go to the columns."""
+    __slots__ = ("_cols", "pos")
+
+    def __init__(self, cols: "ProductColumns", pos: int):
+        self._cols = cols
+        self.pos = pos
+
+    @property
+    def id(self): return self._cols.ids[self.pos]
+    @id.setter
+    def id(self, v: int): self._cols.ids[self.pos] = v
+
+    @property
+    def name(self): return self._cols.names[self.pos]
+    @name.setter
+    def name(self, v: str): self._cols.names[self.pos] = self._cols.intern(v)
+
+    @property
+    def price(self): return self._cols.prices[self.pos]
+    @price.setter
+    def price(self, v: float): self._cols.prices[self.pos] = v
+
+    @property
+    def category(self): return _CATEGORIES[self._cols.categories[self.pos]]
+    @category.setter
+    def category(self, v: ProductCategory): self._cols.categories[self.pos] = _CATEGORY_CODES[v]
+
+    @property
+    def manufacturer(self): return self._cols.manufacturers[self.pos]
+    @manufacturer.setter
+    def manufacturer(self, v: str): self._cols.manufacturers[self.pos] = self._cols.intern(v)
+
+    def __repr__(self):
+        return f"Product(id={self.id}, name={self.name}, price={self.price}, category={self.category.value}, manufacturer={self.manufacturer})"
+
+
+class ProductColumns(Sequence):
+    """Struct-of-arrays product storage: numbers in `array`, categories as 1-byte codes."""
+
+    def __init__(self):
+        self.ids = array("q")
+        self.prices = array("d")
+        self.categories = array("B")
+        self.names: List[str] = []
+        self.manufacturers: List[str] = []
+        self._strings: Dict[str, str] = {}
+
+    def intern(self, s: str) -> str:
+        return self._strings.setdefault(s, s)
+
+    def append(self, product):
+        self.ids.append(product.id)
+        self.prices.append(product.price)
+        self.categories.append(_CATEGORY_CODES[product.category])
+        self.names.append(self.intern(product.name))
+        self.manufacturers.append(self.intern(product.manufacturer))
+
+    def take(self, positions: List[int]) -> "ProductColumns":
+        out = ProductColumns()
+        out._strings = self._strings
+        out.ids = array("q", (self.ids[i] for i in positions))
+        out.prices = array("d", (self.prices[i] for i in positions))
+        out.categories = array("B", (self.categories[i] for i in positions))
+        out.names = [self.names[i] for i in positions]
+        out.manufacturers = [self.manufacturers[i] for i in positions]
+        return out
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [ProductRow(self, i) for i in range(*pos.indices(len(self)))]
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError("product row index out of range")
+        return ProductRow(self, pos)
+
+    def __iter__(self):
+        return (ProductRow(self, i) for i in range(len(self)))
+
+
+class ProductTable(ProductRepository):
+    """ProductRepository over columnar storage; get_all() yields row views."""
+
+    def __init__(self):
+        super().__init__()
+        self._data = ProductColumns()
+
+    def merge_by_mask(self, mask: FieldMaskBits, report: bool = False):
+        merged, sizes = merge_products(self._data, mask)
+        self._data = self._data.take([row.pos for row in merged])
+        self._rebuild_indexes()
+        return sizes if report else None
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+import sys
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, TextIO
+
+from product_fields import ProductFields, compile_mask
+
+if TYPE_CHECKING:
+    from field_mask import FieldMaskBits
+
+Formatter = Callable[[object], object]
+
+DEFAULT_FORMATTERS: Dict[str, Formatter] = {
+    "category": lambda c: c.value,
+}
+
+FORMATS = ("text", "csv", "jsonl", "block")
+
+
+def write_report(
+    products: Iterable,
+    mask: "FieldMaskBits",
+    out: Optional[TextIO] = None,
+    fmt: str = "text",
+    limit: Optional[int] = None,
+    formatters: Optional[Dict[ProductFields, Formatter]] = None,
+    chunk_size: int = 1000,
+) -> int:
+    """Stream the masked fields of `products` to `out`, one write per chunk of rows.
+
+    "text" is a table: a header and one aligned row per product; column widths
+    come from the first chunk, later wider values just push their row out.
+    "block" is the one-field-per-line layout of print_fields.
+    `formatters` override how a field is rendered (keyed by a single ProductFields flag).
+    Returns the number of rows written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown report format {fmt!r}, expected one of {FORMATS}")
+    out = out if out is not None else sys.stdout
+    compiled = mask.compiled
+    attrs = compiled.attrs
+    by_attr = dict(DEFAULT_FORMATTERS)
+    for flag, fn in (formatters or {}).items():
+        flag_attrs = compile_mask(ProductFields(flag)).attrs
+        if len(flag_attrs) != 1:
+            raise ValueError(f"formatter key must be a single ProductFields flag, got {flag!r}")
+        by_attr[flag_attrs[0]] = fn
+    render = [by_attr.get(attr) for attr in attrs]
+
+    rows = products if limit is None else islice(products, limit)
+    buf = io.StringIO()
+    line, flush = _line_writer(fmt, attrs, buf)
+    count = 0
+    for product in rows:
+        values = [v if fn is None else fn(v) for v, fn in zip(compiled.key(product), render)]
+        line(values)
+        count += 1
+        if count % chunk_size == 0:
+            flush()
+            out.write(buf.getvalue())
+            buf.seek(0)
+            buf.truncate()
+    flush()
+    out.write(buf.getvalue())
+    return count
+
+
+def _line_writer(fmt: str, attrs, buf: io.StringIO):
+    """(write one row, flush pending rows into `buf`) for the given format."""
+    if fmt == "csv":
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(attrs)
+        return writer.writerow, _no_flush
+    if fmt == "jsonl":
+        return lambda values: buf.write(json.dumps(dict(zip(attrs, values)), ensure_ascii=False) + "\n"), _no_flush
+    if fmt == "text":
+        return _table_writer(attrs, buf)
+
+    lines = [f"{attr}: {{}}\n" for attr in attrs]
+
+    def block(values):
+        buf.write("----- Product Info -----\n")
+        for template, value in zip(lines, values):
+            buf.write(template.format(value))
+    return block, _no_flush
+
+
+def _no_flush():
+    pass
+
+
+def _table_writer(attrs, buf: io.StringIO):
+    # the first chunk is held back to size the columns, then rows go straight to `buf`
+    pending = []
+    row_format = None
+
+    def write_row(cells):
+        buf.write(row_format.format(*cells).rstrip() + "\n")
+
+    def flush():
+        nonlocal row_format
+        if row_format is not None:
+            return
+        widths = [max([len(attr)] + [len(row[i]) for row in pending]) for i, attr in enumerate(attrs)]
+        row_format = "  ".join(f"{{:<{w}}}" for w in widths)
+        write_row(attrs)
+        write_row(["-" * w for w in widths])
+        for cells in pending:
+            write_row(cells)
+        pending.clear()
+
+    def line(values):
+        cells = [str(v) for v in values]
+        if row_format is None:
+            pending.append(cells)
+        else:
+            write_row(cells)
+    return line, flush
@@ -0,0 +1,104 @@
+from __future__ import annotations
+import asyncio
+import inspect
+from typing import Generic, Iterable, List, Optional, Protocol, Tuple, TypeVar
+
+from main import OrderContext, PipelineStep
+
+TContext = TypeVar("TContext")
+
+
+# ---------------- Асинхронный шаг и адаптер для синхронных ----------------
+
+class AsyncPipelineStep(Protocol, Generic[TContext]):
+    async def execute(self, context: TContext) -> None:
+        ...
+
+
+class SyncStepAdapter(AsyncPipelineStep[TContext]):
+    """Adapter: runs a regular PipelineStep inside the async pipeline.
+
+    Inline the step blocks the event loop (and every other context) until it
+    returns, so a timeout cannot interrupt it. With `in_thread` it runs via
+    asyncio.to_thread: the loop stays free and a timeout fires on time, though
+    the abandoned thread still runs the step to the end.
+    """
+
+    def __init__(self, inner: PipelineStep[TContext], in_thread: bool = False):
+        self._inner = inner
+        self._in_thread = in_thread
+
+    async def execute(self, context: TContext) -> None:
+        if self._in_thread:
+            await asyncio.to_thread(self._inner.execute, context)
+        else:
+            self._inner.execute(context)
+
+
+def as_async_step(step, in_thread: bool = False) -> AsyncPipelineStep:
+    if inspect.iscoroutinefunction(step.execute):
+        return step
+    return SyncStepAdapter(step, in_thread)
+
+
+# ---------------- Асинхронный pipeline ----------------
+
+class AsyncPipeline(Generic[TContext]):
+    def __init__(self, max_concurrency: int = 100, step_timeout: Optional[float] = None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._steps: List[Tuple[AsyncPipelineStep[TContext], Optional[float]]] = []
+        self._max_concurrency = max_concurrency
+        self._step_timeout = step_timeout
+
+    def add_step(self, step, timeout: Optional[float] = None, in_thread: Optional[bool] = None) -> AsyncPipeline[TContext]:
+        """Add a sync or async step; `timeout` (seconds) overrides the pipeline default.
+
+        Sync steps run in a worker thread when `in_thread` is set, and by default
+        whenever they have a timeout, since inline they cannot be timed out.
+        """
+        if timeout is None:
+            timeout = self._step_timeout
+        if in_thread is None:
+            in_thread = timeout is not None
+        self._steps.append((as_async_step(step, in_thread), timeout))
+        return self
+
+    async def execute(self, context: TContext) -> None:
+        for step, timeout in self._steps:
+            if getattr(context, "is_done", False):
+                break
+            if timeout is None:
+                await step.execute(context)
+            else:
+                await asyncio.wait_for(step.execute(context), timeout)
+
+    async def execute_many(self, contexts: Iterable[TContext]) -> List[Optional[BaseException]]:
+        """Run contexts concurrently, at most `max_concurrency` at a time.
+
+        A failing context (e.g. a step timeout) does not stop the others; the
+        result holds the exception per context, or None on success.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def run_one(context: TContext) -> None:
+            async with semaphore:
+                await self.execute(context)
+
+        return list(await asyncio.gather(*(run_one(c) for c in contexts), return_exceptions=True))
+
+
+# ---------------- Фейковый платёжный шлюз ----------------
+
+class FakePaymentGatewayStep(AsyncPipelineStep[OrderContext]):
+    """Local stand-in for a payment gateway with configurable latency."""
+
+    def __init__(self, latency: float = 0.05):
+        self._latency = latency
+
+    async def execute(self, context: OrderContext) -> None:
+        print(f"[Gateway] Asking gateway about order {context.order_id}...")
+        await asyncio.sleep(self._latency)
+        if not context.is_paid:
+            print(f"[Gateway] Order {context.order_id} is not paid. Stopping pipeline.")
+            context.is_done = True
@@ -0,0 +1,92 @@
+from __future__ import annotations
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+from main import PipelineStep
+
+TContext = TypeVar("TContext")
+
+_MISSING = object()
+
+
+class _RecordingProxy:
+    """Stands in for the context while the step runs and records every assignment made through it."""
+    __slots__ = ("_target", "_assigned")
+
+    def __init__(self, target: Any):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_assigned", {})
+
+    @property
+    def __class__(self):
+        return type(self._target)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._assigned[name] = value
+        setattr(self._target, name, value)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class CachingDecorator(PipelineStep[TContext]):
+    """Memoizes a step that is a pure function of `key_attrs` of the context.
+
+    On a miss the step runs against a recording proxy of the context and the
+    attributes it assigned (including `is_done`, and values equal to the old
+    ones) are remembered; on a hit those assignments are replayed instead of
+    running the step again. Attributes changed behind the proxy, e.g. by the
+    context's own methods, are picked up by comparing with the state before the
+    step. In-place changes to mutable attribute values are not seen.
+    Entries are evicted LRU beyond `maxsize` and expire after `ttl` seconds.
+    """
+
+    def __init__(self, inner: PipelineStep[TContext], key_attrs: Sequence[str], maxsize: int = 1024, ttl: Optional[float] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._inner = inner
+        self._key_attrs = tuple(key_attrs)
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._cache: OrderedDict[Tuple, Tuple[float, Tuple[Tuple[str, Any], ...]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def execute(self, context: TContext) -> None:
+        key = tuple(getattr(context, attr) for attr in self._key_attrs)
+        entry = self._cache.get(key)
+        if entry is not None and (self._ttl is None or monotonic() - entry[0] < self._ttl):
+            self._cache.move_to_end(key)
+            self.hits += 1
+            for attr, value in entry[1]:
+                setattr(context, attr, value)
+            return
+
+        self.misses += 1
+        before = dict(vars(context))
+        proxy = _RecordingProxy(context)
+        self._inner.execute(proxy)  # type: ignore[arg-type]
+        assigned = proxy._assigned
+        for attr, value in vars(context).items():
+            if attr not in assigned and before.get(attr, _MISSING) is not value:
+                assigned[attr] = value
+        mutations = tuple((attr, vars(context)[attr]) for attr in assigned if attr in vars(context))
+        self._cache[key] = (monotonic(), mutations)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, len(self._cache), self._maxsize)
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
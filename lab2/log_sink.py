@@ -0,0 +1,115 @@
+from __future__ import annotations
+import json
+import sys
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, List, NamedTuple, Optional, TextIO
+
+
+class LogRecord(NamedTuple):
+    step: str
+    context_id: Any
+    start_ns: int
+    end_ns: int
+
+
+def default_context_id(context: Any) -> Any:
+    for attr in ("order_id", "username"):
+        value = getattr(context, attr, None)
+        if value is not None:
+            return value
+    return id(context)
+
+
+class BufferedLogSink:
+    """Bounded in-memory buffer drained by a background writer thread.
+
+    Records are written as JSON lines in batches. When the buffer is full the
+    `policy` decides: "drop" discards the oldest record (ring buffer), "block"
+    waits for the writer to make room.
+    """
+
+    POLICIES = ("drop", "block")
+
+    def __init__(
+        self,
+        out: Optional[TextIO] = None,
+        capacity: int = 10000,
+        batch_size: int = 500,
+        policy: str = "drop",
+        context_id: Callable[[Any], Any] = default_context_id,
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {self.POLICIES}")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._out = out if out is not None else sys.stdout
+        self._capacity = capacity
+        self._batch_size = batch_size
+        self._policy = policy
+        self._context_id = context_id
+        self._buffer: Deque[LogRecord] = deque()
+        self._in_flight = 0  # records taken by the writer but not yet written out
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+        self._writer = threading.Thread(target=self._drain, name="log-sink-writer", daemon=True)
+        self._writer.start()
+
+    def emit(self, step: str, context: Any, start_ns: int, end_ns: int) -> None:
+        record = LogRecord(step, self._context_id(context), start_ns, end_ns)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("log sink is closed")
+            while len(self._buffer) >= self._capacity:
+                if self._policy == "drop":
+                    self._buffer.popleft()
+                    self.dropped += 1
+                    break
+                # wake the writer: a buffer smaller than batch_size never triggers it on its own
+                self._cond.notify_all()
+                self._cond.wait()
+            self._buffer.append(record)
+            if len(self._buffer) >= self._batch_size:
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Wait until everything emitted so far has been written."""
+        with self._cond:
+            self._cond.notify_all()
+            while self._buffer or self._in_flight:
+                self._cond.wait()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+
+    def __enter__(self) -> BufferedLogSink:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _drain(self) -> None:
+        while True:
+            with self._cond:
+                # wake up for a full batch, a flush/close, or every 100 ms
+                if len(self._buffer) < self._batch_size and not self._closed:
+                    self._cond.wait(0.1)
+                batch: List[LogRecord] = []
+                while self._buffer and len(batch) < self._batch_size:
+                    batch.append(self._buffer.popleft())
+                self._in_flight = len(batch)
+                done = self._closed and not self._buffer
+                self._cond.notify_all()
+            if batch:
+                self._out.write("".join(json.dumps(r._asdict(), default=str) + "\n" for r in batch))
+                self._out.flush()
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+            if done:
+                return
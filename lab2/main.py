@@ -1,6 +1,8 @@
 from __future__ import annotations
-from typing import Generic, TypeVar, List, Protocol
+from typing import Any, Callable, Dict, Generic, Iterable, NamedTuple, Optional, TypeVar, List, Protocol, Tuple
 from datetime import datetime
+from functools import partial
+from time import time_ns
 
 TContext = TypeVar("TContext")
 
@@ -12,6 +14,32 @@ class PipelineStep(Protocol, Generic[TContext]):
         ...
 
 
+class StepHooks(NamedTuple):
+    """Before/after code of a decorator, for Pipeline.compile().
+
+    When `passes_token` is set, whatever `before()` returns is handed to `after(token)`;
+    otherwise both are called without arguments.
+    """
+    before: Callable[[], Any]
+    after: Callable[..., None]
+    passes_token: bool = False
+
+
+def flatten_step(step: PipelineStep[TContext]) -> Tuple[List[StepHooks], PipelineStep[TContext]]:
+    """Peel decorators that provide `as_hooks()`; returns hooks (outermost first) and the core step.
+
+    A decorator whose `as_hooks()` returns None stays in place as part of the core step.
+    """
+    hooks: List[StepHooks] = []
+    while hasattr(step, "as_hooks"):
+        hook = step.as_hooks()
+        if hook is None:
+            break
+        hooks.append(hook)
+        step = step._inner
+    return hooks, step
+
+
 class Pipeline(Generic[TContext]):
     def __init__(self):
         self._steps: List[PipelineStep[TContext]] = []
@@ -27,6 +55,51 @@ class Pipeline(Generic[TContext]):
                 break
             step.execute(context)
 
+    def execute_many(self, contexts: Iterable[TContext]) -> None:
+        """Run a batch step by step; finished contexts leave the working set.
+
+        Whether a context has `is_done` is resolved once per context type.
+        """
+        has_flag: Dict[type, bool] = {}
+        live = []
+        for context in contexts:
+            ctx_type = type(context)
+            if ctx_type not in has_flag:
+                has_flag[ctx_type] = hasattr(context, "is_done")
+            live.append((context, has_flag[ctx_type]))
+
+        for step in self._steps:
+            live = [item for item in live if not (item[1] and item[0].is_done)]
+            if not live:
+                break
+            for context, _ in live:
+                step.execute(context)
+
+    def compile(self) -> Callable[[TContext], None]:
+        """Build one flat function for the current steps.
+
+        Decorators are unwrapped into inline before/after hook calls, so the
+        ordering and the is_done short-circuit stay the same as in execute().
+        Steps added later are not part of the compiled function.
+        """
+        namespace: Dict[str, Any] = {}
+        lines = ["def run(context):"]
+        for i, step in enumerate(self._steps):
+            hooks, core = flatten_step(step)
+            lines.append("    if getattr(context, 'is_done', False): return")
+            for j, hook in enumerate(hooks):
+                namespace[f"b{i}_{j}"] = hook.before
+                namespace[f"a{i}_{j}"] = hook.after
+                lines.append(f"    t{i}_{j} = b{i}_{j}()" if hook.passes_token else f"    b{i}_{j}()")
+            namespace[f"s{i}"] = core.execute
+            lines.append(f"    s{i}(context)")
+            for j in reversed(range(len(hooks))):
+                lines.append(f"    a{i}_{j}(t{i}_{j})" if hooks[j].passes_token else f"    a{i}_{j}()")
+        if len(lines) == 1:
+            lines.append("    pass")
+        exec("\n".join(lines), namespace)
+        return namespace["run"]
+
 
 # ---------------- Контексты ----------------
 
@@ -74,14 +147,31 @@ class ValidateUserStep(PipelineStep[UserContext]):
 # ---------------- Декораторы ----------------
 
 class LoggingDecorator(PipelineStep[TContext]):
-    def __init__(self, inner: PipelineStep[TContext]):
+    """Logs around a step: prints by default, or hands one record per call to `sink`.
+
+    A sink only needs `emit(step_name, context, start_ns, end_ns)`, see log_sink.py.
+    """
+
+    def __init__(self, inner: PipelineStep[TContext], sink: Any = None):
         self._inner = inner
+        self._sink = sink
 
     def execute(self, context: TContext) -> None:
+        if self._sink is not None:
+            start = time_ns()
+            self._inner.execute(context)
+            self._sink.emit(self._inner.__class__.__name__, context, start, time_ns())
+            return
         print(f"[LOG] Starting {self._inner.__class__.__name__}")
         self._inner.execute(context)
         print(f"[LOG] Finished {self._inner.__class__.__name__}")
 
+    def as_hooks(self) -> Optional[StepHooks]:
+        if self._sink is not None:
+            return None  # the sink needs the context, which hooks do not receive
+        name = self._inner.__class__.__name__
+        return StepHooks(partial(print, f"[LOG] Starting {name}"), partial(print, f"[LOG] Finished {name}"))
+
 
 class TimeMeasureDecorator(PipelineStep[TContext]):
     def __init__(self, inner: PipelineStep[TContext]):
@@ -93,6 +183,14 @@ class TimeMeasureDecorator(PipelineStep[TContext]):
         duration = (datetime.now() - start).total_seconds() * 1000
         print(f"[TIMER] {self._inner.__class__.__name__} took {duration:.2f} ms")
 
+    def as_hooks(self) -> StepHooks:
+        name = self._inner.__class__.__name__
+
+        def after(start: datetime) -> None:
+            duration = (datetime.now() - start).total_seconds() * 1000
+            print(f"[TIMER] {name} took {duration:.2f} ms")
+        return StepHooks(datetime.now, after, passes_token=True)
+
 
 # ---------------- Демонстрация ----------------
 
@@ -0,0 +1,138 @@
+from __future__ import annotations
+import sys
+import threading
+from time import perf_counter_ns
+from typing import Dict, Optional, TextIO, TypeVar
+
+from main import PipelineStep, StepHooks
+
+TContext = TypeVar("TContext")
+
+# Each power of two is split into 4 sub-buckets, so a reported percentile is
+# at most 25% above the real value. 44 powers cover everything up to ~2.4 hours.
+_SUB_BITS = 2
+_POWERS = 44
+_BUCKETS = _POWERS << _SUB_BITS
+
+
+def _bucket_upper_ns(index: int) -> int:
+    power, sub = divmod(index, 1 << _SUB_BITS)
+    if power < _SUB_BITS + 1:
+        return 1 << power
+    shift = power - _SUB_BITS - 1
+    return ((1 << _SUB_BITS) + sub + 1) << shift
+
+
+# ---------------- Гистограмма задержек ----------------
+
+class LatencyHistogram:
+    __slots__ = ("name", "count", "total_ns", "max_ns", "_counts")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self._counts = [0] * _BUCKETS
+
+    def record(self, ns: int) -> None:
+        bits = ns.bit_length()
+        if bits > _SUB_BITS:
+            index = (bits << _SUB_BITS) | ((ns >> (bits - _SUB_BITS - 1)) & ((1 << _SUB_BITS) - 1))
+            if index >= _BUCKETS:
+                index = _BUCKETS - 1
+        else:
+            index = bits << _SUB_BITS
+        self._counts[index] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q: float) -> int:
+        """Upper bound (ns) of the bucket holding the q-th percentile."""
+        if not self.count:
+            return 0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if n and seen >= rank:
+                return min(_bucket_upper_ns(index), self.max_ns)
+        return self.max_ns
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1000 if self.count else 0.0,
+            "p50_us": self.percentile(50) / 1000,
+            "p95_us": self.percentile(95) / 1000,
+            "p99_us": self.percentile(99) / 1000,
+            "max_us": self.max_ns / 1000,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._dumper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        hist = self._histograms.get(name)
+        if hist is None:
+            hist = self._histograms[name] = LatencyHistogram(name)
+        return hist
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {name: hist.snapshot() for name, hist in self._histograms.items()}
+
+    def dump(self, out: Optional[TextIO] = None) -> None:
+        out = out if out is not None else sys.stdout
+        lines = [
+            f"[METRICS] {name}: count={s['count']} p50={s['p50_us']:.1f}us "
+            f"p95={s['p95_us']:.1f}us p99={s['p99_us']:.1f}us max={s['max_us']:.1f}us"
+            for name, s in self.snapshot().items()
+        ]
+        out.write("\n".join(lines) + "\n" if lines else "")
+
+    def start_periodic_dump(self, interval: float, out: Optional[TextIO] = None) -> None:
+        if self._dumper is not None:
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.dump(out)
+
+        self._dumper = threading.Thread(target=loop, name="metrics-dump", daemon=True)
+        self._dumper.start()
+
+    def stop_periodic_dump(self) -> None:
+        if self._dumper is None:
+            return
+        self._stop.set()
+        self._dumper.join()
+        self._dumper = None
+
+
+GLOBAL_METRICS = MetricsRegistry()
+
+
+# ---------------- Декоратор ----------------
+
+class MetricsDecorator(PipelineStep[TContext]):
+    """Records step latency into a histogram instead of printing every call."""
+
+    def __init__(self, inner: PipelineStep[TContext], registry: MetricsRegistry = GLOBAL_METRICS, name: Optional[str] = None):
+        self._inner = inner
+        self._histogram = registry.histogram(name or inner.__class__.__name__)
+
+    def execute(self, context: TContext) -> None:
+        start = perf_counter_ns()
+        self._inner.execute(context)
+        self._histogram.record(perf_counter_ns() - start)
+
+    def as_hooks(self) -> StepHooks:
+        record = self._histogram.record
+        return StepHooks(perf_counter_ns, lambda start: record(perf_counter_ns() - start), passes_token=True)
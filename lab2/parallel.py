@@ -0,0 +1,49 @@
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, TypeVar
+
+from main import Pipeline
+
+TContext = TypeVar("TContext")
+
+_worker_pipeline: Optional[Pipeline] = None
+
+
+def _init_worker(pipeline: Pipeline) -> None:
+    # the pipeline is pickled once per worker, not once per chunk
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _run_chunk(chunk: List[TContext]) -> List[TContext]:
+    for context in chunk:
+        _worker_pipeline.execute(context)
+    return chunk
+
+
+def execute_sharded(
+    pipeline: Pipeline[TContext],
+    contexts: Iterable[TContext],
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    min_parallel: int = 1000,
+) -> List[TContext]:
+    """Run `pipeline` over `contexts` in a process pool, results in input order.
+
+    Contexts and the pipeline must be picklable. Workers mutate copies, so the
+    returned list holds the processed contexts. Batches smaller than
+    `min_parallel` run in this process and are mutated in place.
+    """
+    contexts = list(contexts)
+    if len(contexts) < min_parallel:
+        for context in contexts:
+            pipeline.execute(context)
+        return contexts
+
+    workers = max_workers or os.cpu_count() or 1
+    # a few chunks per worker keeps the pool balanced without pickling per item
+    size = chunk_size or max(1, -(-len(contexts) // (workers * 4)))
+    chunks = [contexts[i:i + size] for i in range(0, len(contexts), size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pipeline,)) as pool:
+        return [context for chunk in pool.map(_run_chunk, chunks) for context in chunk]
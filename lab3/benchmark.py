@@ -0,0 +1,188 @@
+"""Micro-benchmarks for the builder system.
+
+Run: python benchmark.py [tasks]   (default 100000)
+"""
+from __future__ import annotations
+import __future__
+import gc
+import inspect
+import os
+import re
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+from main import (
+    BaseMutable, DatabaseBuilder, ProjectImmutable, TaskImmutableBuilder, ProjectMutable, SqlFileWriter, SqliteWriter, TaskImmutable, TaskMutable,
+    UserImmutable, UserMutable, set_creation_site_tracking,
+)
+
+
+def build_graph(tasks: int, tasks_per_project: int = 20) -> Tuple[List[UserMutable], List[ProjectMutable], List[TaskMutable]]:
+    projects_count = max(1, tasks // tasks_per_project)
+    users = [UserMutable(username=f"user{i}", email=f"user{i}@example.com") for i in range(projects_count)]
+    projects = [ProjectMutable(name=f"project{i}", owner=users[i]) for i in range(projects_count)]
+    task_list = [
+        TaskMutable(title=f"task{i}", project=projects[i % projects_count], assignee=users[(i * 7) % projects_count])
+        for i in range(tasks)
+    ]
+    return users, projects, task_list
+
+
+def _validate_all(users, projects, tasks, memo) -> int:
+    errors: List[str] = []
+    for group in (users, projects, tasks):
+        for obj in group:
+            errors.extend(obj.collect_validation(memo))
+    return len(errors)
+
+
+def bench_validation(tasks: int) -> None:
+    start = perf_counter()
+    users, projects, task_list = build_graph(tasks)
+    print(f"graph: {len(users)} users, {len(projects)} projects, {len(task_list)} tasks, built in {perf_counter() - start:.2f}s")
+
+    start = perf_counter()
+    _validate_all(users, projects, task_list, None)
+    plain = perf_counter() - start
+
+    start = perf_counter()
+    memo: Dict[int, List[str]] = {}
+    _validate_all(users, projects, task_list, memo)
+    memoized = perf_counter() - start
+    print(f"validation: plain {plain:.3f}s, memoized by temp_id {memoized:.3f}s, x{plain / memoized:.1f}")
+
+
+def bench_construction(count: int) -> None:
+    for enabled in (True, False):
+        set_creation_site_tracking(enabled)
+        start = perf_counter()
+        for i in range(count):
+            UserMutable(username="u", email="u@example.com")
+        elapsed = perf_counter() - start
+        print(f"construction, creation site {'on ' if enabled else 'off'}: {count} users in {elapsed:.3f}s")
+    set_creation_site_tracking(True)
+
+
+def bench_persist(tasks: int) -> None:
+    users, projects, task_list = build_graph(tasks)
+    with tempfile.TemporaryDirectory() as tmp:
+        sql_path = os.path.join(tmp, "out.sql")
+        start = perf_counter()
+        DatabaseBuilder().persist(users, projects, task_list, out_path=sql_path)
+        print(f"persist to SQL file: {perf_counter() - start:.3f}s, {os.path.getsize(sql_path)} bytes")
+
+        start = perf_counter()
+        DatabaseBuilder().persist(users, projects, task_list, writer=SqlFileWriter(sql_path, batch_size=500))
+        print(f"persist to SQL file, 500 rows per INSERT: {perf_counter() - start:.3f}s, {os.path.getsize(sql_path)} bytes")
+
+        parallel_path = os.path.join(tmp, "parallel.sql")
+        start = perf_counter()
+        DatabaseBuilder().persist_parallel(users, projects, task_list, out_path=parallel_path)
+        elapsed = perf_counter() - start
+        DatabaseBuilder().persist(users, projects, task_list, out_path=sql_path)
+        with open(sql_path, "rb") as a, open(parallel_path, "rb") as b:
+            same = a.read() == b.read()
+        print(f"persist_parallel ({os.cpu_count()} CPUs): {elapsed:.3f}s, identical to serial: {same}")
+
+        db_path = os.path.join(tmp, "out.db")
+        start = perf_counter()
+        DatabaseBuilder().persist(users, projects, task_list, writer=SqliteWriter(db_path))
+        print(f"persist to SQLite (executemany): {perf_counter() - start:.3f}s")
+
+
+def _measure(factory: Callable[[int], Any], count: int) -> Tuple[float, float]:
+    """(bytes per object, objects per second) for `count` calls of `factory`."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    start = perf_counter()
+    objs = [factory(i) for i in range(count)]
+    elapsed = perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0] - base - sys.getsizeof(objs)
+    tracemalloc.stop()
+    del objs
+    return used / count, count / elapsed
+
+
+def _dict_backed_models() -> Dict[str, type]:
+    """The mutable models recompiled from their own source minus __slots__: the former __dict__ layout.
+
+    Constructors, setters and creation-site capture are the same code, so only the layout differs.
+    """
+    import main
+    namespace = dict(vars(main))
+    for cls in (BaseMutable, UserMutable, ProjectMutable, TaskMutable):
+        source = re.sub(r"^[ \t]+__slots__ = .*\n", "", inspect.getsource(cls).replace("\r\n", "\n"), flags=re.M)
+        exec(compile(source, main.__file__, "exec", flags=__future__.annotations.compiler_flag, dont_inherit=True), namespace)
+    return {cls.__name__: namespace[cls.__name__] for cls in (UserMutable, ProjectMutable, TaskMutable)}
+
+
+def bench_memory(count: int) -> None:
+    # "before": dict-backed copies of the same classes, running the same __init__
+    user = UserMutable(username="u", email="u@example.com")
+    project = ProjectMutable(name="p", owner=user)
+    dict_backed = _dict_backed_models()
+    before_immutable = {
+        cls: make_dataclass(cls.__name__ + "Dict", [(f.name, f.type) for f in fields(cls)], frozen=True)
+        for cls in (UserImmutable, ProjectImmutable, TaskImmutable)
+    }
+    cases = [
+        ("UserMutable",
+         lambda i: dict_backed["UserMutable"](username="u", email="u@example.com"),
+         lambda i: UserMutable(username="u", email="u@example.com")),
+        ("TaskMutable",
+         lambda i: dict_backed["TaskMutable"](title="t", project=project, assignee=user),
+         lambda i: TaskMutable(title="t", project=project, assignee=user)),
+        ("UserImmutable",
+         lambda i: before_immutable[UserImmutable](id=i, username="u", email=None),
+         lambda i: UserImmutable(id=i, username="u", email=None)),
+        ("TaskImmutable",
+         lambda i: before_immutable[TaskImmutable](id=i, title="t", project_id=1, assignee_id=None, completed=False),
+         lambda i: TaskImmutable(id=i, title="t", project_id=1, assignee_id=None, completed=False)),
+    ]
+    for name, before, after in cases:
+        b_bytes, b_rate = _measure(before, count)
+        a_bytes, a_rate = _measure(after, count)
+        print(f"{name}: dict-backed {b_bytes:.0f} B/obj {b_rate:,.0f} obj/s -> slotted {a_bytes:.0f} B/obj {a_rate:,.0f} obj/s")
+
+
+def bench_immutable_builder(count: int) -> None:
+    def by_constructor(b: TaskImmutableBuilder, **changes: Any) -> TaskImmutableBuilder:
+        # what every with_* used to do: list all fields in a keyword constructor call
+        values = {"title": b.title, "project_id": b.project_id, "assignee_id": b.assignee_id, "completed": b.completed}
+        values.update(changes)
+        return TaskImmutableBuilder(**values)
+
+    start = perf_counter()
+    for i in range(count):
+        b = by_constructor(TaskImmutableBuilder(), title="t")
+        b = by_constructor(b, project_id=1)
+        by_constructor(b, assignee_id=2).build(i)
+    before = perf_counter() - start
+
+    start = perf_counter()
+    for i in range(count):
+        TaskImmutableBuilder().with_title("t").with_project(1).with_assignee(2).build(i)
+    chained = perf_counter() - start
+
+    start = perf_counter()
+    TaskImmutableBuilder.build_many(range(count), ["t"] * count, [1] * count, [2] * count)
+    batch = perf_counter() - start
+    print(f"immutable tasks: keyword-constructor chain {before:.3f}s, generated with_* {chained:.3f}s, build_many {batch:.3f}s")
+
+
+def main() -> None:
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    bench_construction(tasks)
+    bench_validation(tasks)
+    bench_persist(tasks)
+    bench_memory(tasks)
+    bench_immutable_builder(tasks)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,59 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple, Any, Callable, Iterable
-import inspect, os, json
+from dataclasses import dataclass, field, fields
+from typing import List, Dict, Optional, Tuple, Any, Callable, Iterable, Iterator, TextIO
+from collections import ChainMap
+import os, sys, json, sqlite3, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # ---------------------- Utilities ----------------------
+# Creation sites are recorded in debug runs and skipped under `python -O`;
+# set_creation_site_tracking() overrides this at runtime.
+_TRACK_CREATION_SITE = __debug__
+_init_depth: Dict[type, int] = {}
+_sites: Dict[Tuple[str, int], Tuple[str, int]] = {}
+
+def set_creation_site_tracking(enabled: bool) -> None:
+    global _TRACK_CREATION_SITE
+    _TRACK_CREATION_SITE = enabled
+
 def creation_site(offset=1) -> str:
     """Return short trace of where an object was created: filename:lineno"""
-    frame = inspect.stack()[offset]
-    return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+    frame = sys._getframe(offset)
+    return format_site((frame.f_code.co_filename, frame.f_lineno))
+
+def format_site(site: Optional[Tuple[str, int]]) -> str:
+    if site is None:
+        return "unknown"
+    return f"{os.path.basename(site[0])}:{site[1]}"
+
+def _capture_site(obj: Any) -> Tuple[str, int]:
+    """(filename, lineno) of the code that constructed `obj`, past its own __init__ chain."""
+    depth = _init_depth.get(type(obj))
+    if depth is None:
+        depth = 2  # skip this function and BaseMutable.__init__
+        frame = sys._getframe(depth)
+        while frame.f_back is not None and frame.f_code.co_name == "__init__" and frame.f_locals.get("self") is obj:
+            frame = frame.f_back
+            depth += 1
+        _init_depth[type(obj)] = depth
+    frame = sys._getframe(depth)
+    site = (frame.f_code.co_filename, frame.f_lineno)
+    return _sites.setdefault(site, site)  # objects created on the same line share one tuple
 
 # ---------------------- Immutable models ----------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UserImmutable:
     id: int
     username: str
     email: Optional[str]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProjectImmutable:
     id: int
     name: str
     owner_id: int
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TaskImmutable:
     id: int
     title: str
@@ -32,15 +63,54 @@ class TaskImmutable:
 
 # ---------------------- Mutable models for builder ----------------------
 class BaseMutable:
+    # __slots__ everywhere in the hierarchy: no per-instance __dict__
+    __slots__ = ("temp_id", "_site", "_version", "_deferred")
     _temp_counter = 1
     def __init__(self):
         self.temp_id = BaseMutable._temp_counter
         BaseMutable._temp_counter += 1
-        self.creation_site = creation_site(2)
-    def collect_validation(self) -> List[str]:
+        # only filename and line are kept; the string is built when an error is reported
+        self._site = _capture_site(self) if _TRACK_CREATION_SITE else None
+        # bumped by every setter; each DatabaseBuilder remembers the version it persisted
+        self._version = 0
+        # inside a BulkScopeConfigurator setters store raw values; checks run on scope exit
+        self._deferred = False
+
+    @property
+    def creation_site(self) -> str:
+        return format_site(self._site)
+
+    def collect_validation(self, memo: Optional[Dict[int, List[str]]] = None) -> List[str]:
+        """All errors of this object and the objects it references.
+
+        With `memo` (temp_id -> errors) every object is validated once and its
+        result is shared by everything that references it.
+        """
+        if memo is None:
+            return self._collect(None)
+        cached = memo.get(self.temp_id)
+        if cached is None:
+            cached = memo[self.temp_id] = self._collect(memo)
+        return cached
+
+    def _collect(self, memo: Optional[Dict[int, List[str]]]) -> List[str]:
+        errs = self._own_errors()
+        for ref in self._references():
+            errs.extend(ref.collect_validation(memo))
+        return errs
+
+    def _own_errors(self) -> List[str]:
+        return []
+
+    def _references(self) -> List["BaseMutable"]:
         return []
 
+    def _normalize(self) -> None:
+        """Apply the clean-up the setters do (e.g. strip) after deferred assignments."""
+
 class UserMutable(BaseMutable):
+    __slots__ = ("_username", "_email")
+
     def __init__(self, username: str = "", email: Optional[str] = None):
         super().__init__()
         self._username = username
@@ -50,19 +120,27 @@ class UserMutable(BaseMutable):
     def username(self): return self._username
     @username.setter
     def username(self, v: str):
-        if not v or not v.strip():
-            raise ValueError("username cannot be empty")
-        self._username = v.strip()
+        if not self._deferred:
+            if not v or not v.strip():
+                raise ValueError("username cannot be empty")
+            v = v.strip()
+        self._username = v
+        self._version += 1
 
     @property
     def email(self): return self._email
     @email.setter
     def email(self, v: Optional[str]):
-        if v is not None and "@" not in v:
+        if not self._deferred and v is not None and "@" not in v:
             raise ValueError("email seems invalid")
         self._email = v
+        self._version += 1
+
+    def _normalize(self) -> None:
+        if self._username:
+            self._username = self._username.strip()
 
-    def collect_validation(self) -> List[str]:
+    def _own_errors(self) -> List[str]:
         errs = []
         if not self._username or not self._username.strip():
             errs.append("username empty")
@@ -71,6 +149,8 @@ class UserMutable(BaseMutable):
         return [f"{self.creation_site} - User(temp_id={self.temp_id}): {e}" for e in errs]
 
 class ProjectMutable(BaseMutable):
+    __slots__ = ("_name", "_owner")
+
     def __init__(self, name: str = "", owner: Optional[UserMutable] = None):
         super().__init__()
         self._name = name
@@ -80,30 +160,40 @@ class ProjectMutable(BaseMutable):
     def name(self): return self._name
     @name.setter
     def name(self, v: str):
-        if not v or not v.strip():
-            raise ValueError("project name cannot be empty")
-        self._name = v.strip()
+        if not self._deferred:
+            if not v or not v.strip():
+                raise ValueError("project name cannot be empty")
+            v = v.strip()
+        self._name = v
+        self._version += 1
 
     @property
     def owner(self): return self._owner
     @owner.setter
     def owner(self, v: UserMutable):
-        if v is None:
+        if not self._deferred and v is None:
             raise ValueError("project owner cannot be None")
         self._owner = v
+        self._version += 1
+
+    def _normalize(self) -> None:
+        if self._name:
+            self._name = self._name.strip()
 
-    def collect_validation(self) -> List[str]:
+    def _own_errors(self) -> List[str]:
         errs = []
         if not self._name or not self._name.strip():
             errs.append("name empty")
         if not self._owner:
             errs.append("owner missing")
-        nested = []
-        if self._owner:
-            nested.extend(self._owner.collect_validation())
-        return [f"{self.creation_site} - Project(temp_id={self.temp_id}): {e}" for e in errs] + nested
+        return [f"{self.creation_site} - Project(temp_id={self.temp_id}): {e}" for e in errs]
+
+    def _references(self) -> List[BaseMutable]:
+        return [self._owner] if self._owner else []
 
 class TaskMutable(BaseMutable):
+    __slots__ = ("_title", "_project", "_assignee", "_completed")
+
     def __init__(self, title: str = "", project: Optional[ProjectMutable] = None, assignee: Optional[UserMutable] = None):
         super().__init__()
         self._title = title
@@ -115,40 +205,47 @@ class TaskMutable(BaseMutable):
     def title(self): return self._title
     @title.setter
     def title(self, v: str):
-        if not v or not v.strip():
-            raise ValueError("task title cannot be empty")
-        self._title = v.strip()
+        if not self._deferred:
+            if not v or not v.strip():
+                raise ValueError("task title cannot be empty")
+            v = v.strip()
+        self._title = v
+        self._version += 1
 
     @property
     def project(self): return self._project
     @project.setter
     def project(self, v: ProjectMutable):
-        if v is None:
+        if not self._deferred and v is None:
             raise ValueError("task project cannot be None")
         self._project = v
+        self._version += 1
 
     @property
     def assignee(self): return self._assignee
     @assignee.setter
     def assignee(self, v: Optional[UserMutable]):
         self._assignee = v
+        self._version += 1
 
     def mark_done(self):
         self._completed = True
+        self._version += 1
+
+    def _normalize(self) -> None:
+        if self._title:
+            self._title = self._title.strip()
 
-    def collect_validation(self) -> List[str]:
+    def _own_errors(self) -> List[str]:
         errs = []
         if not self._title or not self._title.strip():
             errs.append("title empty")
         if not self._project:
             errs.append("project missing")
-        nested = []
-        if self._project:
-            nested.extend(self._project.collect_validation())
-        if self._assignee:
-            nested.extend(self._assignee.collect_validation())
-        formatted = [f"{self.creation_site} - Task(temp_id={self.temp_id}): {e}" for e in errs]
-        return formatted + nested
+        return [f"{self.creation_site} - Task(temp_id={self.temp_id}): {e}" for e in errs]
+
+    def _references(self) -> List[BaseMutable]:
+        return [o for o in (self._project, self._assignee) if o]
 
 # ---------------------- Abstract builder pattern ----------------------
 class AbstractBuilder:
@@ -245,94 +342,422 @@ class ScopeConfigurator:
     def __exit__(self, exc_type, exc, tb):
         return False
 
-# ---------------------- Database builder: map temp_id -> final ids, produce SQL ----------------------
+_state_slots_cache: Dict[type, Tuple[str, ...]] = {}
+
+def _state_slots(cls: type) -> Tuple[str, ...]:
+    """Slots that hold the editable state of a mutable model (what a rollback restores)."""
+    names = _state_slots_cache.get(cls)
+    if names is None:
+        skip = {"temp_id", "_site", "_deferred"}
+        names = tuple(n for c in cls.__mro__ for n in getattr(c, "__slots__", ()) if n not in skip)
+        _state_slots_cache[cls] = names
+    return names
+
+class BulkScopeConfigurator:
+    """Scope that configures many mutable models at once, all or nothing.
+
+    `applier` receives whole batches (lists) of objects. Inside the scope the
+    setters only store values; on exit every object is normalized and validated
+    once. If the applier, the with-block or the validation fails, every object
+    gets back the state it had before the scope.
+    """
+    def __init__(self, objects: Iterable[BaseMutable], applier: Callable[[List[BaseMutable]], None], batch_size: Optional[int] = None):
+        self.objects = list(objects)
+        self.applier = applier
+        self.batch_size = batch_size or max(1, len(self.objects))
+        self._saved: List[Tuple[BaseMutable, List[Any]]] = []
+
+    def __enter__(self):
+        self._saved = [(o, [getattr(o, n) for n in _state_slots(type(o))]) for o in self.objects]
+        for o in self.objects:
+            o._deferred = True
+        try:
+            for i in range(0, len(self.objects), self.batch_size):
+                self.applier(self.objects[i:i + self.batch_size])
+        except BaseException:
+            self._rollback()
+            raise
+        return self.objects
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._rollback()
+            return False
+        for o in self.objects:
+            o._deferred = False
+            o._normalize()
+        errors = [e for o in self.objects for e in o._own_errors()]
+        if errors:
+            self._rollback()
+            raise ValueError("Scope validation failed, changes rolled back:\n" + "\n".join(errors))
+        return False
+
+    def _rollback(self) -> None:
+        for o, values in self._saved:
+            for name, value in zip(_state_slots(type(o)), values):
+                setattr(o, name, value)
+            o._deferred = False
+
+# ---------------------- Database writers: SQL script file or SQLite database ----------------------
+SCHEMA_SQL = [
+    "CREATE TABLE IF NOT EXISTS users(id INTEGER PRIMARY KEY, username TEXT NOT NULL, email TEXT);",
+    "CREATE TABLE IF NOT EXISTS projects(id INTEGER PRIMARY KEY, name TEXT NOT NULL, owner_id INTEGER NOT NULL, FOREIGN KEY(owner_id) REFERENCES users(id));",
+    "CREATE TABLE IF NOT EXISTS tasks(id INTEGER PRIMARY KEY, title TEXT NOT NULL, project_id INTEGER NOT NULL, assignee_id INTEGER, completed INTEGER, FOREIGN KEY(project_id) REFERENCES projects(id), FOREIGN KEY(assignee_id) REFERENCES users(id));",
+]
+
+INSERT_USERS = "INSERT INTO users(id, username, email) VALUES"
+INSERT_PROJECTS = "INSERT INTO projects(id, name, owner_id) VALUES"
+INSERT_TASKS = "INSERT INTO tasks(id, title, project_id, assignee_id, completed) VALUES"
+
+Row = Tuple[Any, ...]
+
+def sql_literal(v: Any) -> str:
+    if v is None:
+        return "NULL"
+    if isinstance(v, str):
+        return "'" + v.replace("'", "''") + "'"
+    return str(v)
+
+def upsert(prefix: str) -> str:
+    return prefix.replace("INSERT INTO", "INSERT OR REPLACE INTO", 1)
+
+_TABLE_INSERTS = (INSERT_USERS, INSERT_PROJECTS, INSERT_TASKS)
+
+def iter_inserts(prefix: str, rows: Iterable[Row], batch_size: int = 1) -> Iterator[str]:
+    """INSERT statements for the rows of one table, up to `batch_size` rows each."""
+    batch: List[str] = []
+    for row in rows:
+        batch.append(f"({', '.join(sql_literal(v) for v in row)})")
+        if len(batch) >= batch_size:
+            yield prefix + ",".join(batch) + ";"
+            batch = []
+    if batch:
+        yield prefix + ",".join(batch) + ";"
+
+def iter_sql_statements(users: Iterable[Row], projects: Iterable[Row], tasks: Iterable[Row], batch_size: int = 1, replace: bool = False) -> Iterator[str]:
+    """Yield the SQL script statement by statement; rows are pulled lazily.
+
+    With `batch_size` > 1 consecutive rows of a table share one multi-row INSERT.
+    With `replace` rows are written as INSERT OR REPLACE (used by delta persists).
+    """
+    yield "BEGIN TRANSACTION;"
+    yield from SCHEMA_SQL
+    for prefix, rows in zip(_TABLE_INSERTS, (users, projects, tasks)):
+        yield from iter_inserts(upsert(prefix) if replace else prefix, rows, batch_size)
+    yield "COMMIT;"
+
+class SqlFileWriter:
+    """Streams rows into a plain SQL script, `chunk_size` statements per file write.
+
+    With `append` the script is added after the existing content of `out_path`.
+    """
+    def __init__(self, out_path: str, batch_size: int = 1, chunk_size: int = 1000, append: bool = False):
+        if batch_size < 1 or chunk_size < 1:
+            raise ValueError("batch_size and chunk_size must be at least 1")
+        self.out_path = out_path
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.append = append
+
+    def write(self, users: Iterable[Row], projects: Iterable[Row], tasks: Iterable[Row], replace: bool = False) -> str:
+        return self.write_statements(iter_sql_statements(users, projects, tasks, self.batch_size, replace))
+
+    def write_statements(self, statements: Iterable[str]) -> str:
+        """Write already rendered statements (one per line) to `out_path`."""
+        has_content = self.append and os.path.exists(self.out_path) and os.path.getsize(self.out_path) > 0
+        with open(self.out_path, "a" if self.append else "w", encoding="utf-8") as f:
+            self.write_to(f, statements, "\n" if has_content else "")
+        return f"OK: SQL written to {self.out_path}"
+
+    def write_to(self, f: TextIO, statements: Iterable[str], sep: str = "") -> None:
+        chunk: List[str] = []
+        for stmt in statements:
+            chunk.append(stmt)
+            if len(chunk) >= self.chunk_size:
+                f.write(sep + "\n".join(chunk))
+                chunk = []
+                sep = "\n"
+        if chunk:
+            f.write(sep + "\n".join(chunk))
+
+DEFAULT_SQLITE_PRAGMAS: Dict[str, str] = {"journal_mode": "WAL", "synchronous": "NORMAL"}
+
+class SqliteWriter:
+    """Loads rows straight into a SQLite database: executemany with bound parameters, one transaction."""
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, str]] = None):
+        self.db_path = db_path
+        self.pragmas = DEFAULT_SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    def write(self, users: Iterable[Row], projects: Iterable[Row], tasks: Iterable[Row], replace: bool = False) -> str:
+        insert = upsert if replace else (lambda prefix: prefix)
+        loaded = 0
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name}={value}")
+            conn.execute("BEGIN")
+            try:
+                for stmt in SCHEMA_SQL:
+                    conn.execute(stmt)
+                loaded += conn.executemany(insert(INSERT_USERS) + "(?, ?, ?)", users).rowcount
+                loaded += conn.executemany(insert(INSERT_PROJECTS) + "(?, ?, ?)", projects).rowcount
+                loaded += conn.executemany(insert(INSERT_TASKS) + "(?, ?, ?, ?, ?)", tasks).rowcount
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return f"OK: {loaded} rows loaded into {self.db_path}"
+
+# ---------------------- Database builder: map temp_id -> final ids, produce rows for a writer ----------------------
 class DatabaseBuilder:
+    """Maps temp ids to final ids; the map and the id counter live as long as the builder.
+
+    save_state/load_state carry only the id counter to a later process, so new
+    rows never reuse an exported id. Temp ids exist only in the process that
+    created them, so objects of a new process are always new rows: an earlier
+    export cannot be extended with tasks that refer to its projects or users.
+    """
     def __init__(self):
         self._id_map: Dict[int,int] = {}
+        self._versions: Dict[int,int] = {}  # temp_id -> _version written by this builder
         self._next_id = 1
-        self._sql_parts: List[str] = []
-
-    def _alloc(self) -> int:
-        v = self._next_id; self._next_id += 1; return v
 
-    def persist(self, users: List[UserMutable], projects: List[ProjectMutable], tasks: List[TaskMutable], out_path: str = "/mnt/data/demo_output.sql") -> Tuple[bool, str]:
-        # aggregate validations for all objects (don't stop at first)
+    def _changed(self, obj: BaseMutable) -> bool:
+        return self._versions.get(obj.temp_id) != obj._version
+
+    def save_state(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"next_id": self._next_id}, f)
+
+    @classmethod
+    def load_state(cls, path: str) -> "DatabaseBuilder":
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        db = cls()
+        db._next_id = state["next_id"]
+        return db
+
+    def persist(self, users: List[UserMutable], projects: List[ProjectMutable], tasks: List[TaskMutable], out_path: str = "/mnt/data/demo_output.sql", writer: Any = None, incremental: bool = False) -> Tuple[bool, str]:
+        """Validate the graph, allocate final ids and hand the rows to `writer`.
+
+        Without `writer` the rows go to a SQL script at `out_path`; pass
+        SqliteWriter(db_path) to load them into SQLite instead.
+
+        With `incremental` objects persisted earlier by this builder keep their
+        id, ones unchanged since this builder wrote them are skipped and changed
+        ones are written as INSERT OR REPLACE, so the cost follows the size of
+        the change. The default writer then appends the delta to `out_path`.
+        """
+        if incremental:
+            users = [u for u in users if self._changed(u)]
+            projects = [p for p in projects if self._changed(p)]
+            tasks = [t for t in tasks if self._changed(t)]
+
+        # aggregate validations for all objects (don't stop at first);
+        # the memo validates each object once even if many tasks reference it
         errors: List[str] = []
+        memo: Dict[int, List[str]] = {}
         for u in users:
-            errors.extend(u.collect_validation())
+            errors.extend(u.collect_validation(memo))
         for p in projects:
-            errors.extend(p.collect_validation())
+            errors.extend(p.collect_validation(memo))
         for t in tasks:
-            errors.extend(t.collect_validation())
+            errors.extend(t.collect_validation(memo))
 
         if errors:
             return False, "Validation failed:\n" + "\n".join(errors)
 
-        # allocate IDs and produce SQL INSERTs (no direct references in objects)
-        users_sql: List[str] = []
-        projects_sql: List[str] = []
-        tasks_sql: List[str] = []
-
-        for u in users:
-            fid = self._alloc(); self._id_map[u.temp_id] = fid
-            username_safe = u.username.replace("'", "''")
-            if u.email:
-                email_safe = u.email.replace("'", "''")
-                email_val = "'" + email_safe + "'"
-            else:
-                email_val = "NULL"
-            users_sql.append(f"INSERT INTO users(id, username, email) VALUES({fid}, '{username_safe}', {email_val});")
-
-        for p in projects:
-            fid = self._alloc(); self._id_map[p.temp_id] = fid
-            name_safe = p._name.replace("'", "''")
-            owner_id = self._id_map[p._owner.temp_id]
-            projects_sql.append(f"INSERT INTO projects(id, name, owner_id) VALUES({fid}, '{name_safe}', {owner_id});")
+        # allocate IDs and produce rows (no direct references in objects);
+        # rows are generated lazily, in order, while the writer consumes them.
+        # ids and versions reach the builder only after the writer succeeded,
+        # so a failed write leaves nothing marked as persisted
+        new_ids: Dict[int, int] = {}
+        versions: Dict[int, int] = {}
+        ids = ChainMap(new_ids, self._id_map) if self._id_map else new_ids
+        next_id = self._next_id
+
+        def assign(obj: BaseMutable) -> int:
+            """Final id to write `obj` under; a delta persist reuses the id given earlier."""
+            nonlocal next_id
+            versions[obj.temp_id] = obj._version
+            fid = self._id_map.get(obj.temp_id) if incremental else None
+            if fid is None:
+                fid = next_id; next_id += 1
+            new_ids[obj.temp_id] = fid
+            return fid
+
+        def users_rows() -> Iterator[Row]:
+            for u in users:
+                yield user_row(u, assign(u), ids)
+
+        def projects_rows() -> Iterator[Row]:
+            for p in projects:
+                yield project_row(p, assign(p), ids)
+
+        def tasks_rows() -> Iterator[Row]:
+            for t in tasks:
+                yield task_row(t, assign(t), ids)
+
+        if writer is None:
+            writer = SqlFileWriter(out_path, append=incremental)
+        msg = writer.write(users_rows(), projects_rows(), tasks_rows(), replace=incremental)
+        self._id_map.update(new_ids)
+        self._versions.update(versions)
+        self._next_id = next_id
+        return True, msg
+
+    def persist_parallel(self, users: List[UserMutable], projects: List[ProjectMutable], tasks: List[TaskMutable], out_path: str = "/mnt/data/demo_output.sql", writer: Any = None, max_workers: Optional[int] = None, min_parallel: int = 1000) -> Tuple[bool, str]:
+        """persist() with validation and SQL rendering spread over a process pool.
+
+        Final ids follow the position of each object in the input lists, exactly
+        as the serial allocator hands them out, so every slice of a list knows
+        its ids up front. Workers are forked and inherit the graph (nothing is
+        pickled on the way in); each validates a slice and renders its INSERT
+        statements, slices being whole multiples of the writer's batch_size, and
+        the parent only splices the text, so the output is identical to persist().
+        A writer without write_statements (SqliteWriter) gets rows built by the
+        workers instead. Small graphs (< `min_parallel` objects), and platforms
+        without fork, use persist() directly.
+        """
+        users, projects, tasks = list(users), list(projects), list(tasks)
+        groups = (users, projects, tasks)
+        total = len(users) + len(projects) + len(tasks)
+        if total < min_parallel or "fork" not in multiprocessing.get_all_start_methods():
+            return self.persist(users, projects, tasks, out_path=out_path, writer=writer)
+
+        # temp_id -> the id the serial allocator would give, for references
+        base = self._next_id
+        ids: Dict[int, int] = {}
+        fid = base
+        for group in groups:
+            for obj in group:
+                ids[obj.temp_id] = fid
+                fid += 1
+
+        if writer is None:
+            writer = SqlFileWriter(out_path)
+        render = hasattr(writer, "write_statements")
+        batch_size = getattr(writer, "batch_size", 1)
+        workers = max_workers or os.cpu_count() or 1
+        jobs = _slice_jobs(groups, workers * 4, batch_size)
+
+        global _PARALLEL_STATE
+        _PARALLEL_STATE = (groups, ids, batch_size, render)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+                results = list(pool.map(_persist_slice, jobs))
+        finally:
+            _PARALLEL_STATE = None
+
+        errors = [e for errs, _ in results for e in errs]
+        if errors:
+            return False, "Validation failed:\n" + "\n".join(errors)
 
-        for t in tasks:
-            fid = self._alloc(); self._id_map[t.temp_id] = fid
-            title_safe = t._title.replace("'", "''")
-            proj_id = self._id_map[t._project.temp_id]
-            assignee_val = "NULL"
-            if t._assignee:
-                assignee_val = str(self._id_map[t._assignee.temp_id])
-            completed_val = "1" if t._completed else "0"
-            tasks_sql.append(f"INSERT INTO tasks(id, title, project_id, assignee_id, completed) VALUES({fid}, '{title_safe}', {proj_id}, {assignee_val}, {completed_val});")
-
-        sql = "\n".join([
-            "BEGIN TRANSACTION;",
-            "CREATE TABLE IF NOT EXISTS users(id INTEGER PRIMARY KEY, username TEXT NOT NULL, email TEXT);",
-            "CREATE TABLE IF NOT EXISTS projects(id INTEGER PRIMARY KEY, name TEXT NOT NULL, owner_id INTEGER NOT NULL, FOREIGN KEY(owner_id) REFERENCES users(id));",
-            "CREATE TABLE IF NOT EXISTS tasks(id INTEGER PRIMARY KEY, title TEXT NOT NULL, project_id INTEGER NOT NULL, assignee_id INTEGER, completed INTEGER, FOREIGN KEY(project_id) REFERENCES projects(id), FOREIGN KEY(assignee_id) REFERENCES users(id));",
-            *users_sql, *projects_sql, *tasks_sql,
-            "COMMIT;"
-        ])
-
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(sql)
-
-        return True, f"OK: SQL written to {out_path}"
+        if render:
+            msg = writer.write_statements(["BEGIN TRANSACTION;", *SCHEMA_SQL, *(text for _, text in results if text), "COMMIT;"])
+        else:
+            rows: Tuple[List[Row], List[Row], List[Row]] = ([], [], [])
+            for (kind, _, _), (_, part) in zip(jobs, results):
+                rows[kind].extend(part)
+            msg = writer.write(*rows)
+        self._id_map.update(ids)
+        self._next_id = base + total
+        for group in groups:
+            for obj in group:
+                self._versions[obj.temp_id] = obj._version
+        return True, msg
+
+# ---------------------- Rows and parallel persist helpers ----------------------
+def user_row(u: UserMutable, fid: int, ids: Dict[int, int]) -> Row:
+    return (fid, u.username, u.email or None)
+
+def project_row(p: ProjectMutable, fid: int, ids: Dict[int, int]) -> Row:
+    return (fid, p._name, ids[p._owner.temp_id])
+
+def task_row(t: TaskMutable, fid: int, ids: Dict[int, int]) -> Row:
+    assignee_id = ids[t._assignee.temp_id] if t._assignee else None
+    return (fid, t._title, ids[t._project.temp_id], assignee_id, 1 if t._completed else 0)
+
+_ROW_BUILDERS = (user_row, project_row, task_row)
+
+# (groups, temp_id -> id, batch_size, render) of the running persist_parallel; forked workers inherit it
+_PARALLEL_STATE: Optional[Tuple[Tuple[List[Any], ...], Dict[int, int], int, bool]] = None
+
+def _slice_jobs(groups: Tuple[List[Any], ...], parts: int, batch_size: int) -> List[Tuple[int, int, int]]:
+    """(kind, start, stop) slices of every list; kind 0/1/2 = user/project/task.
+
+    Slice lengths are multiples of `batch_size`, so multi-row INSERTs come out as in a serial write.
+    """
+    total = sum(len(g) for g in groups)
+    size = max(batch_size, -(-max(1, total // parts) // batch_size) * batch_size)
+    return [(kind, start, min(start + size, len(group)))
+            for kind, group in enumerate(groups) for start in range(0, len(group), size)]
+
+def _persist_slice(job: Tuple[int, int, int]) -> Tuple[List[str], Any]:
+    """Worker: validate a slice and, if it is clean, render its INSERT statements (or build its rows)."""
+    kind, start, stop = job
+    groups, ids, batch_size, render = _PARALLEL_STATE
+    objs = groups[kind][start:stop]
+    memo: Dict[int, List[str]] = {}
+    errors = [e for obj in objs for e in obj.collect_validation(memo)]
+    if errors:
+        return errors, None
+    build = _ROW_BUILDERS[kind]
+    rows = (build(obj, ids[obj.temp_id], ids) for obj in objs)
+    if not render:
+        return [], list(rows)
+    return [], "\n".join(iter_inserts(_TABLE_INSERTS[kind], rows, batch_size))
 
 # ---------------------- Functional (immutable-only) builder example ----------------------
-@dataclass(frozen=True)
+def _slot_function(cls: type, name: str, params: List[str], sources: Dict[str, str]) -> Callable[..., Any]:
+    """Generate a function that fills a new instance of a slotted (frozen) dataclass slot by slot.
+
+    `sources` maps every field to the expression that provides its value. Slots are
+    written through their member descriptors, which skips both __init__ argument
+    handling and the frozen __setattr__.
+    """
+    names = [f.name for f in fields(cls)]
+    lines = [f"def {name}({', '.join(params)}):", "    new = _new(_cls)"]
+    lines += [f"    _set_{n}(new, {sources[n]})" for n in names]
+    lines.append("    return new")
+    namespace: Dict[str, Any] = {"_new": object.__new__, "_cls": cls}
+    namespace.update({f"_set_{n}": getattr(cls, n).__set__ for n in names})
+    exec("\n".join(lines), namespace)
+    return namespace[name]
+
+def with_methods(**aliases: str) -> Callable[[type], type]:
+    """Class decorator: add `with_<field>(value)` for every field, plus `alias=field` names."""
+    def decorate(cls: type) -> type:
+        names = [f.name for f in fields(cls)]
+        for field_name in names:
+            method = _slot_function(cls, f"with_{field_name}", ["self", "value"],
+                                    {n: "value" if n == field_name else f"self.{n}" for n in names})
+            setattr(cls, f"with_{field_name}", method)
+        for alias, field_name in aliases.items():
+            setattr(cls, alias, getattr(cls, f"with_{field_name}"))
+        return cls
+    return decorate
+
+_make_task = _slot_function(TaskImmutable, "make_task", [f.name for f in fields(TaskImmutable)],
+                            {f.name: f.name for f in fields(TaskImmutable)})
+
+@with_methods(with_project="project_id", with_assignee="assignee_id")
+@dataclass(frozen=True, slots=True)
 class TaskImmutableBuilder:
-    """Example of building a TaskImmutable in a Linq-like immutable chain."""
+    """Example of building a TaskImmutable in a Linq-like immutable chain.
+
+    with_title / with_project / with_assignee (and with_<field> for every field)
+    are generated by @with_methods.
+    """
     title: str = ""
     project_id: Optional[int] = None
     assignee_id: Optional[int] = None
     completed: bool = False
 
-    def with_title(self, title: str) -> "TaskImmutableBuilder":
-        return TaskImmutableBuilder(title=title, project_id=self.project_id, assignee_id=self.assignee_id, completed=self.completed)
-
-    def with_project(self, project_id: int) -> "TaskImmutableBuilder":
-        return TaskImmutableBuilder(title=self.title, project_id=project_id, assignee_id=self.assignee_id, completed=self.completed)
-
-    def with_assignee(self, assignee_id: Optional[int]) -> "TaskImmutableBuilder":
-        return TaskImmutableBuilder(title=self.title, project_id=self.project_id, assignee_id=assignee_id, completed=self.completed)
-
     def mark_done(self) -> "TaskImmutableBuilder":
-        return TaskImmutableBuilder(title=self.title, project_id=self.project_id, assignee_id=self.assignee_id, completed=True)
+        return self.with_completed(True)
 
     def build(self, final_id: int) -> TaskImmutable:
         if not self.title or not self.title.strip():
@@ -341,6 +766,23 @@ class TaskImmutableBuilder:
             raise ValueError("project_id missing for immutable task builder")
         return TaskImmutable(id=final_id, title=self.title, project_id=self.project_id, assignee_id=self.assignee_id, completed=self.completed)
 
+    @staticmethod
+    def build_many(ids: Iterable[int], titles: Iterable[str], project_ids: Iterable[Optional[int]],
+                   assignee_ids: Optional[Iterable[Optional[int]]] = None,
+                   completed: Optional[Iterable[bool]] = None) -> List[TaskImmutable]:
+        """Build tasks from columns of field values, with the same checks as build()."""
+        ids = list(ids)
+        assignee_ids = [None] * len(ids) if assignee_ids is None else assignee_ids
+        completed = [False] * len(ids) if completed is None else completed
+        result: List[TaskImmutable] = []
+        for row, (fid, title, project_id, assignee_id, done) in enumerate(zip(ids, titles, project_ids, assignee_ids, completed, strict=True)):
+            if not title or not title.strip():
+                raise ValueError(f"row {row}: title empty for immutable task builder")
+            if project_id is None:
+                raise ValueError(f"row {row}: project_id missing for immutable task builder")
+            result.append(_make_task(fid, title, project_id, assignee_id, done))
+        return result
+
 # ---------------------- Demo: main() ----------------------
 def main():
     print("Demo: builders system\n")
@@ -420,6 +862,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-# Run the demo when executed in this environment
-main()
@@ -0,0 +1,138 @@
+"""Micro-benchmarks for dynamiclib contexts.
+
+Run: python benchmark.py [rounds]   (default 20000)
+"""
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable, List
+
+from consumer_project_a import ARMOR_KEY, DAMAGE_KEY, HEALTH_KEY, apply_damage_columns, create_warrior
+from dynamiclib import ArrayDynamicContext, DynamicContext, EntityStore, KeyRegistry, TypedKey
+from dynamiclib.entity_store import HAS_NUMPY
+
+KEY_COUNTS = (10, 50, 200)
+CONTEXTS = (("dict", DynamicContext), ("array", ArrayDynamicContext))
+
+
+def make_keys(count: int) -> List[TypedKey[Any]]:
+    registry = KeyRegistry()
+    types = (int, float, str, bool)
+    return [registry.register("bench", f"key{i}", types[i % len(types)]) for i in range(count)]
+
+
+def sample(key: TypedKey[Any], i: int) -> Any:
+    return {int: i, float: i * 0.5, str: f"v{i}", bool: i % 2 == 0}[key.value_type]
+
+
+def _factory(cls: type, keys: List[TypedKey[Any]]) -> Callable[[], Any]:
+    if cls is ArrayDynamicContext:
+        return lambda: ArrayDynamicContext(keys[-1].id + 1)
+    return cls
+
+
+def bench_access(rounds: int) -> None:
+    for count in KEY_COUNTS:
+        keys = make_keys(count)
+        values = [sample(key, i) for i, key in enumerate(keys)]
+        pairs = list(zip(keys, values))
+        line = []
+        for label, cls in CONTEXTS:
+            ctx = _factory(cls, keys)()
+            per_round = max(1, rounds // count)
+
+            start = perf_counter()
+            for _ in range(per_round):
+                for key, value in pairs:
+                    ctx.set(key, value)
+            set_time = perf_counter() - start
+
+            start = perf_counter()
+            for _ in range(per_round):
+                for key in keys:
+                    ctx.get(key)
+            get_time = perf_counter() - start
+
+            start = perf_counter()
+            for _ in range(max(1, per_round // 10)):
+                ctx.snapshot()
+            snap_time = perf_counter() - start
+
+            ops = per_round * count
+            line.append(
+                f"{label}: set {set_time / ops * 1e9:.0f}ns get {get_time / ops * 1e9:.0f}ns "
+                f"snapshot {snap_time:.3f}s"
+            )
+        print(f"{count:>3} keys | " + " | ".join(line))
+
+
+def bench_memory(entities: int) -> None:
+    for count in KEY_COUNTS:
+        keys = make_keys(count)
+        values = [sample(key, i) for i, key in enumerate(keys)]
+        line = []
+        for label, cls in CONTEXTS:
+            factory = _factory(cls, keys)
+            tracemalloc.start()
+            contexts = []
+            for _ in range(entities):
+                ctx = factory()
+                for key, value in zip(keys, values):
+                    ctx.set(key, value)
+                contexts.append(ctx)
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            line.append(f"{label}: {size / entities:.0f} B/entity")
+        print(f"{count:>3} keys | " + " | ".join(line))
+
+
+def _build_warriors(count: int, store: EntityStore | None) -> List[Any]:
+    return [
+        create_warrior(f"E-{i}", f"w{i}", "Alliance", 100 + i % 50, i % 20, 30, store=store)
+        for i in range(count)
+    ]
+
+
+def bench_store(entities: int) -> None:
+    tracemalloc.start()
+    objects = _build_warriors(entities, None)
+    per_object, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    store = EntityStore(capacity=entities)
+    _build_warriors(entities, store)
+    columnar, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{entities} warriors: Entity objects {per_object / entities:.0f} B/entity, "
+        f"EntityStore {columnar / entities:.0f} B/entity (numpy columns: {HAS_NUMPY})"
+    )
+
+    start = perf_counter()
+    for entity in objects:
+        hp = entity.get(HEALTH_KEY, 0)
+        actual = max(0, entity.get(DAMAGE_KEY, 0) - entity.get(ARMOR_KEY, 0))
+        entity.set(HEALTH_KEY, max(0, hp - actual))
+    looped = perf_counter() - start
+
+    start = perf_counter()
+    apply_damage_columns(store)
+    columns = perf_counter() - start
+    print(f"apply damage: per-entity get/set {looped:.3f}s, apply_damage_columns {columns:.3f}s")
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print("get/set per operation, snapshot total:")
+    bench_access(rounds * 10)
+    print("\nmemory with every key set:")
+    bench_memory(max(1, rounds // 20))
+    print("\ncolumnar entity store:")
+    bench_store(rounds * 5)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Union
 
-from dynamiclib import Entity, EntityPipeline, GLOBAL_KEY_REGISTRY, OperationContext
+from dynamiclib import Entity, EntityPipeline, EntityStore, GLOBAL_KEY_REGISTRY, OperationContext, StoredEntity
 from dynamiclib.library_keys import ENTITY_NAME
 
 HEALTH_KEY = GLOBAL_KEY_REGISTRY.register("consumer_a", "game.health", int)
@@ -24,8 +24,12 @@ def create_warrior(
     health: int,
     armor: int,
     damage: int,
-) -> Entity:
-    entity = Entity(entity_id=entity_id, entity_type="warrior")
+    store: Optional[EntityStore] = None,
+) -> Union[Entity, StoredEntity]:
+    if store is None:
+        entity: Union[Entity, StoredEntity] = Entity(entity_id=entity_id, entity_type="warrior")
+    else:
+        entity = store.create(entity_id, "warrior")
     entity.set(ENTITY_NAME, name)
     entity.set(FACTION_KEY, faction)
     entity.set(HEALTH_KEY, health)
@@ -64,6 +68,23 @@ def apply_damage(entity: Entity, context: OperationContext) -> None:
     )
 
 
+def apply_damage_columns(store: EntityStore) -> None:
+    """apply_damage for every entity of the store at once, over whole columns (no trace lines).
+
+    Missing health/armor/damage count as 0, as in apply_damage.
+    """
+    hp = store.column(HEALTH_KEY)
+    armor = store.column(ARMOR_KEY)
+    damage = store.column(DAMAGE_KEY)
+    if all(store.is_numpy(key) for key in (HEALTH_KEY, ARMOR_KEY, DAMAGE_KEY)):
+        hp[:] = (hp - (damage - armor).clip(min=0)).clip(min=0)
+    else:
+        # array/list columns; list columns hold None where the key is missing
+        for row, (current, block, hit) in enumerate(zip(hp, armor, damage)):
+            hp[row] = max(0, (current or 0) - max(0, (hit or 0) - (block or 0)))
+    store.mark_present(HEALTH_KEY)
+
+
 def grant_xp(entity: Entity, context: OperationContext) -> None:
     hp = entity.get(HEALTH_KEY, 0)
     if hp <= 0:
@@ -1,15 +1,19 @@
-from .dynamic_context import DynamicContext
+from .dynamic_context import ArrayDynamicContext, DynamicContext
 from .entity import Entity
+from .entity_store import EntityStore, StoredEntity
 from .key_registry import GLOBAL_KEY_REGISTRY, KeyConflictError, KeyRegistry, TypedKey
 from .pipeline import EntityPipeline, OperationContext
 
 __all__ = [
+    "ArrayDynamicContext",
     "DynamicContext",
     "Entity",
     "EntityPipeline",
+    "EntityStore",
     "GLOBAL_KEY_REGISTRY",
     "KeyConflictError",
     "KeyRegistry",
     "OperationContext",
+    "StoredEntity",
     "TypedKey",
 ]
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, TypeVar, cast
+from typing import Any, Dict, List, Optional, TypeVar, cast
 
-from .key_registry import TypedKey
+from .key_registry import GLOBAL_KEY_REGISTRY, TypedKey
 
 T = TypeVar("T")
 
@@ -44,3 +44,75 @@ class DynamicContext:
         for typed_key, value in self._values.values():
             result[typed_key.name] = value
         return result
+
+
+class ArrayDynamicContext:
+    """DynamicContext stored in a flat list indexed by `key.id`.
+
+    Key ids are small dense integers handed out by the registry, so a slot per id
+    plus a presence bitmap replaces the dict of `(key, value)` tuples: get and set
+    are two list/bytearray indexings and a write allocates nothing. The storage
+    grows when a key registered after the context was created is set. `snapshot`
+    lists keys in id order.
+    """
+
+    __slots__ = ("_values", "_keys", "_present")
+
+    def __init__(self, capacity: Optional[int] = None) -> None:
+        if capacity is None:
+            capacity = GLOBAL_KEY_REGISTRY.max_id + 1
+        self._values: List[Any] = [None] * capacity
+        self._keys: List[Optional[TypedKey[Any]]] = [None] * capacity
+        self._present = bytearray(capacity)
+
+    def _grow(self, key_id: int) -> None:
+        extra = max(key_id + 1, 2 * len(self._present)) - len(self._present)
+        self._values.extend([None] * extra)
+        self._keys.extend([None] * extra)
+        self._present.extend(bytes(extra))
+
+    def set(self, key: TypedKey[T], value: T) -> None:
+        if type(value) is not key.value_type and not isinstance(value, key.value_type):
+            raise TypeError(
+                f"Key '{key.name}' expects {key.value_type.__name__}, "
+                f"got {type(value).__name__}"
+            )
+        key_id = key.id
+        if key_id >= len(self._present):
+            self._grow(key_id)
+        self._values[key_id] = value
+        self._keys[key_id] = key
+        self._present[key_id] = 1
+
+    def has(self, key: TypedKey[Any]) -> bool:
+        key_id = key.id
+        return key_id < len(self._present) and self._present[key_id] == 1
+
+    def get(self, key: TypedKey[T], default: Optional[T] = None) -> Optional[T]:
+        key_id = key.id
+        try:
+            if self._present[key_id]:
+                return cast(T, self._values[key_id])
+        except IndexError:
+            pass
+        return default
+
+    def require(self, key: TypedKey[T]) -> T:
+        key_id = key.id
+        try:
+            if self._present[key_id]:
+                return cast(T, self._values[key_id])
+        except IndexError:
+            pass
+        raise KeyError(f"Missing required key '{key.name}'")
+
+    def remove(self, key: TypedKey[Any]) -> None:
+        key_id = key.id
+        if key_id < len(self._present):
+            self._present[key_id] = 0
+            self._values[key_id] = None
+            self._keys[key_id] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        # an absent slot always holds None in _keys, so the key list doubles as the mask here
+        return {key.name: value for key, value in zip(self._keys, self._values) if key is not None}
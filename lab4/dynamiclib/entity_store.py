@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, cast
+
+from .key_registry import TypedKey
+
+try:
+    import numpy as np
+except ImportError:  # the store falls back to array/list columns
+    np = None
+
+HAS_NUMPY = np is not None
+
+T = TypeVar("T")
+
+# value type -> (numpy dtype, array typecode) for keys stored in a typed column;
+# any other value type is kept in a plain list
+_TYPED_COLUMNS: Dict[type, tuple[str, str]] = {
+    bool: ("bool", "b"),
+    int: ("int64", "q"),
+    float: ("float64", "d"),
+}
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+class _Column:
+    """Values of one key for every row plus the rows where the key is set.
+
+    Typed columns are NumPy arrays (with spare capacity, the store tracks the
+    row count) or `array` (exact length). Rows without a value hold 0/False
+    in typed columns and None in list columns. A typed column turns into a list
+    column on the first value it cannot hold as is (a bool for an int key, an
+    int outside int64, an instance of a subclass), so values read back exactly
+    as they were set.
+    """
+
+    __slots__ = ("key", "values", "present", "decode", "typed", "_numpy")
+
+    def __init__(self, key: TypedKey[Any], size: int, capacity: int) -> None:
+        self.key = key
+        typed = _TYPED_COLUMNS.get(key.value_type)
+        self.typed = typed is not None
+        self._numpy = typed is not None and np is not None
+        if self._numpy:
+            dtype = typed[0]
+            self.values = np.zeros(capacity, dtype=dtype)
+            self.present = np.zeros(capacity, dtype=bool)
+            self.decode: Callable[[Any], Any] = lambda raw: raw.item()
+        else:
+            if typed is not None:
+                self.values = array(typed[1], bytes(array(typed[1]).itemsize * size))
+            else:
+                self.values = [None] * size
+            self.present = bytearray(size)
+            self.decode = bool if key.value_type is bool else _identity
+
+    def fits(self, value: Any) -> bool:
+        if type(value) is not self.key.value_type:
+            return False
+        return self.key.value_type is not int or _INT64_MIN <= value <= _INT64_MAX
+
+    def to_list(self, size: int) -> None:
+        present = bytearray(self.present[:size].tobytes() if self._numpy else self.present)
+        self.values = [self.decode(v) if p else None for v, p in zip(self.values[:size], present)]
+        self.present = present
+        self.decode = _identity
+        self.typed = self._numpy = False
+
+    def append_row(self) -> None:
+        if not self._numpy:
+            self.values.append(None if isinstance(self.values, list) else 0)
+            self.present.append(0)
+
+    def reserve(self, capacity: int) -> None:
+        if self._numpy and capacity > len(self.values):
+            self.values = np.concatenate([self.values, np.zeros(capacity - len(self.values), self.values.dtype)])
+            self.present = np.concatenate([self.present, np.zeros(capacity - len(self.present), bool)])
+
+    def view(self, size: int) -> Any:
+        return self.values[:size] if self._numpy else self.values
+
+    def present_view(self, size: int) -> Any:
+        return self.present[:size] if self._numpy else self.present
+
+    def mark_all(self, size: int) -> None:
+        if self._numpy:
+            self.present[:size] = True
+        else:
+            self.present[:] = b"\x01" * size
+
+    def clear(self, row: int) -> None:
+        self.present[row] = 0
+        self.values[row] = None if isinstance(self.values, list) else 0
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class StoredEntity:
+    """Row handle into an EntityStore with the same API as Entity."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "EntityStore", row: int) -> None:
+        self._store = store
+        self._row = row
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def entity_id(self) -> str:
+        return self._store._entity_ids[self._row]
+
+    @property
+    def entity_type(self) -> str:
+        return self._store._entity_types[self._row]
+
+    def set(self, key: TypedKey[T], value: T) -> None:
+        self._store.set(self._row, key, value)
+
+    def has(self, key: TypedKey[Any]) -> bool:
+        return self._store.has(self._row, key)
+
+    def get(self, key: TypedKey[T], default: Optional[T] = None) -> Optional[T]:
+        return self._store.get(self._row, key, default)
+
+    def require(self, key: TypedKey[T]) -> T:
+        return self._store.require(self._row, key)
+
+    def remove(self, key: TypedKey[Any]) -> None:
+        self._store.remove(self._row, key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = self._store.snapshot(self._row)
+        data["__entity_id"] = self.entity_id
+        data["__entity_type"] = self.entity_type
+        return data
+
+    def __repr__(self) -> str:
+        return f"StoredEntity(entity_id={self.entity_id!r}, entity_type={self.entity_type!r})"
+
+
+class EntityStore:
+    """Entities stored column-wise: one column per TypedKey, one row per entity.
+
+    `create` returns a StoredEntity handle, so pipeline operations written
+    against Entity work unchanged, while `column`/`present` expose whole
+    columns for bulk updates. With NumPy installed int/float/bool keys are
+    NumPy arrays, otherwise `array`; other value types, and typed keys that got
+    a value the array cannot hold exactly, are lists. Rows are append-only.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._capacity = max(1, capacity)
+        self._entity_ids: List[str] = []
+        self._entity_types: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[int, _Column] = {}
+
+    def __len__(self) -> int:
+        return len(self._entity_ids)
+
+    def __iter__(self) -> Iterator[StoredEntity]:
+        return (StoredEntity(self, row) for row in range(len(self._entity_ids)))
+
+    def __getitem__(self, row: int) -> StoredEntity:
+        if not 0 <= row < len(self._entity_ids):
+            raise IndexError("entity row out of range")
+        return StoredEntity(self, row)
+
+    def create(self, entity_id: str, entity_type: str) -> StoredEntity:
+        if entity_id in self._rows:
+            raise ValueError(f"Entity '{entity_id}' already exists")
+        row = len(self._entity_ids)
+        if row == self._capacity:
+            self._capacity *= 2
+            for column in self._columns.values():
+                column.reserve(self._capacity)
+        self._entity_ids.append(entity_id)
+        self._entity_types.append(entity_type)
+        self._rows[entity_id] = row
+        for column in self._columns.values():
+            column.append_row()
+        return StoredEntity(self, row)
+
+    def find(self, entity_id: str) -> Optional[StoredEntity]:
+        row = self._rows.get(entity_id)
+        return None if row is None else StoredEntity(self, row)
+
+    def _column(self, key: TypedKey[Any]) -> _Column:
+        column = self._columns.get(key.id)
+        if column is None:
+            column = self._columns[key.id] = _Column(key, len(self._entity_ids), self._capacity)
+        return column
+
+    def set(self, row: int, key: TypedKey[T], value: T) -> None:
+        if not isinstance(value, key.value_type):
+            raise TypeError(
+                f"Key '{key.name}' expects {key.value_type.__name__}, "
+                f"got {type(value).__name__}"
+            )
+        column = self._column(key)
+        if column.typed and not column.fits(value):
+            column.to_list(len(self._entity_ids))
+        column.values[row] = value
+        column.present[row] = 1
+
+    def has(self, row: int, key: TypedKey[Any]) -> bool:
+        column = self._columns.get(key.id)
+        return column is not None and bool(column.present[row])
+
+    def get(self, row: int, key: TypedKey[T], default: Optional[T] = None) -> Optional[T]:
+        column = self._columns.get(key.id)
+        if column is None or not column.present[row]:
+            return default
+        return cast(T, column.decode(column.values[row]))
+
+    def require(self, row: int, key: TypedKey[T]) -> T:
+        column = self._columns.get(key.id)
+        if column is None or not column.present[row]:
+            raise KeyError(f"Missing required key '{key.name}'")
+        return cast(T, column.decode(column.values[row]))
+
+    def remove(self, row: int, key: TypedKey[Any]) -> None:
+        column = self._columns.get(key.id)
+        if column is not None:
+            column.clear(row)
+
+    def snapshot(self, row: int) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for column in self._columns.values():
+            if column.present[row]:
+                result[column.key.name] = column.decode(column.values[row])
+        return result
+
+    def is_numpy(self, key: TypedKey[Any]) -> bool:
+        """Whether `column(key)` is a NumPy array (and not an array/list)."""
+        return self._column(key)._numpy
+
+    def column(self, key: TypedKey[Any]) -> Any:
+        """Values of `key` for all rows, writable in place; absent rows hold 0/False/None.
+
+        A NumPy view when NumPy backs the column, otherwise the array/list itself.
+        Writing through it does not mark rows as set, see `mark_present`. Fetch
+        the column again after `create`, a NumPy-backed one is reallocated as it grows.
+        """
+        return self._column(key).view(len(self._entity_ids))
+
+    def present(self, key: TypedKey[Any]) -> Any:
+        """Per-row flags (bool NumPy array or bytearray) telling where `key` is set."""
+        return self._column(key).present_view(len(self._entity_ids))
+
+    def mark_present(self, key: TypedKey[Any]) -> None:
+        """Mark `key` as set on every row, after a bulk write through `column`."""
+        self._column(key).mark_all(len(self._entity_ids))
@@ -51,5 +51,9 @@ class KeyRegistry:
     def all_keys(self) -> list[TypedKey[Any]]:
         return list(self._by_name.values())
 
+    @property
+    def max_id(self) -> int:
+        return self._next_id - 1
+
 
 GLOBAL_KEY_REGISTRY = KeyRegistry()